@@ -0,0 +1,116 @@
+"""Per-command overhead of each way of talking to the browser, measured against the fixture search page.
+
+Transports compared:
+  fresh-connection  WebDriver HTTP client that opens a new connection per command (keep-alive off)
+  pooled            WebDriver HTTP client with keep-alive pooling (what setup_driver uses)
+  devtools          one Runtime.evaluate per script over the DevTools websocket
+  devtools-batch    the same scripts pipelined over the websocket with evaluate_many
+
+    python bench/command_overhead.py                     # local chromedriver, started by the benchmark
+    python bench/command_overhead.py --remote http://grid:4444 --commands 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service
+
+from instrumentation import percentile
+from server import start_server
+from transport import pooled_executor, DevToolsTransport, DevToolsError
+
+SCRIPT = "return document.querySelectorAll('button').length"
+
+def make_options(headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    return options
+
+def timed(fn, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def row(transport, command, latencies):
+    return {
+        "transport": transport,
+        "command": command,
+        "n": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+    }
+
+def webdriver_rows(label, driver, count):
+    return [
+        row(label, "execute_script", timed(lambda: driver.execute_script(SCRIPT), count)),
+        row(label, "find_elements", timed(lambda: driver.find_elements(By.CSS_SELECTOR, "button"), count)),
+        row(label, "current_url", timed(lambda: driver.current_url, count)),
+    ]
+
+def devtools_rows(driver, count, batch_size):
+    try:
+        transport = DevToolsTransport.connect(driver)
+    except DevToolsError as e:
+        print(f"[skip] devtools: {e}")
+        return []
+    try:
+        rows = [row("devtools", "evaluate", timed(lambda: transport.evaluate(SCRIPT), count))]
+        batch = [(SCRIPT, (), False)] * batch_size
+        per_batch = timed(lambda: transport.evaluate_many(batch), max(1, count // batch_size))
+        rows.append(row("devtools-batch", f"evaluate x{batch_size}", [ms / batch_size for ms in per_batch]))
+        return rows
+    finally:
+        transport.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--remote", help="Remote WebDriver URL; by default a local chromedriver is started")
+    parser.add_argument("--commands", type=int, default=100, help="Commands timed per transport and command type")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = start_server()
+    service = None
+    if args.remote:
+        executor_url = args.remote
+    else:
+        service = Service()
+        service.start()
+        executor_url = service.service_url
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+    results = []
+    try:
+        for label, executor in (("fresh-connection", RemoteConnection(executor_url, keep_alive=False)),
+                                ("pooled", pooled_executor(executor_url))):
+            driver = webdriver.Remote(options=make_options(not args.headed), command_executor=executor)
+            try:
+                driver.get(f"{base_url}/search/results/people/?keywords=engineer")
+                results += webdriver_rows(label, driver, args.commands)
+                if label == "pooled":
+                    results += devtools_rows(driver, args.commands, args.batch_size)
+            finally:
+                driver.quit()
+    finally:
+        if service is not None:
+            service.stop()
+        server.shutdown()
+
+    print(f"\n{'transport':>18} {'command':>16} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for r in results:
+        print(f"{r['transport']:>18} {r['command']:>16} {r['n']:>5} {r['mean_ms']:>9.3f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""In-memory stand-in for the parts of gspread the connector uses, counting every API call"""
+import re
+from collections import Counter
+
+def a1_to_rowcol(cell):
+    match = re.match(r"^([A-Z]+)(\d+)$", cell)
+    column = 0
+    for letter in match.group(1):
+        column = column * 26 + ord(letter) - ord("A") + 1
+    return int(match.group(2)), column
+
+class FakeWorksheet:
+    def __init__(self, rows, col_count=None):
+        self.rows = [list(row) for row in rows]
+        self.row_count = len(self.rows)
+        self.col_count = col_count or max(len(row) for row in self.rows)
+        self.calls = Counter()
+
+    def cell(self, row, column):
+        values = self.rows[row - 1] if row <= len(self.rows) else []
+        return values[column - 1] if column <= len(values) else ""
+
+    def row_values(self, row):
+        self.calls["row_values"] += 1
+        values = list(self.rows[row - 1])
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def get(self, a1_range):
+        """Like gspread: trailing empty rows and cells are dropped"""
+        self.calls["get"] += 1
+        start, end = a1_range.split(":")
+        (top, left), (bottom, right) = a1_to_rowcol(start), a1_to_rowcol(end)
+        values = []
+        for row in range(top, min(bottom, self.row_count) + 1):
+            cells = [self.cell(row, column) for column in range(left, right + 1)]
+            while cells and cells[-1] == "":
+                cells.pop()
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls["batch_update"] += 1
+        for entry in data:
+            start, end = entry["range"].split(":")
+            (top, left), (bottom, right) = a1_to_rowcol(start), a1_to_rowcol(end)
+            if right > self.col_count:
+                raise ValueError(f"Range {entry['range']} exceeds grid limits ({self.col_count} columns)")
+            for row, values in zip(range(top, bottom + 1), entry["values"]):
+                target = self.rows[row - 1]
+                target.extend([""] * (right - len(target)))
+                target[left - 1:left - 1 + len(values)] = values
+
+    def add_cols(self, count):
+        self.calls["add_cols"] += 1
+        self.col_count += count
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self.sheet1 = worksheet
+
+class FakeClient:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def open_by_url(self, url):
+        return FakeSpreadsheet(self.worksheet)
@@ -0,0 +1,99 @@
+// Minimal stand-in for the LinkedIn widgets the connector drives: Connect/More buttons,
+// the invitation modal, search pagination and the location filter.
+(function () {
+    function el(html) {
+        var t = document.createElement('template');
+        t.innerHTML = html.trim();
+        return t.content.firstChild;
+    }
+
+    var pendingButton = null;
+
+    function openInviteModal(button) {
+        pendingButton = button;
+        // Render the dialog a little later, like the real page does
+        setTimeout(function () {
+            document.body.appendChild(el(
+                '<div role="dialog" class="artdeco-modal">' +
+                '<h2>Add a note to your invitation?</h2>' +
+                '<button aria-label="Add a note"><span>Add a note</span></button>' +
+                '<button aria-label="Send without a note"><span>Send without a note</span></button>' +
+                '</div>'));
+        }, 150);
+    }
+
+    function closeInviteModal() {
+        setTimeout(function () {
+            var dialog = document.querySelector('div[role="dialog"]');
+            if (dialog) dialog.remove();
+            if (pendingButton && pendingButton.getAttribute('role') === 'menuitem') {
+                // An invitation sent from More puts a Pending button in the profile's primary actions
+                var primary = pendingButton.closest('section').querySelector('button');
+                primary.parentNode.insertBefore(
+                    el('<button aria-label="Pending, click to withdraw invitation"><span>Pending</span></button>'), primary);
+                pendingButton.remove();
+                pendingButton = null;
+            } else if (pendingButton) {
+                pendingButton.setAttribute('aria-label', 'Pending, click to withdraw invitation');
+                pendingButton.innerHTML = '<span>Pending</span>';
+                pendingButton = null;
+            }
+            var menu = document.querySelector('div[role="menu"]');
+            if (menu) menu.style.display = 'none';
+        }, 150);
+    }
+
+    function buttonLabel(button) {
+        var span = button.querySelector('span');
+        return span ? span.textContent.trim() : button.textContent.trim();
+    }
+
+    document.addEventListener('click', function (event) {
+        var target = event.target.closest('button, [role="menuitem"]');
+        if (!target) return;
+        var label = buttonLabel(target);
+        var aria = target.getAttribute('aria-label');
+        if (target.getAttribute('role') === 'menuitem' && label === 'Connect') {
+            openInviteModal(target);
+        } else if (label === 'Connect') {
+            openInviteModal(target);
+        } else if (label === 'More') {
+            var menu = document.querySelector('div[role="menu"]');
+            menu.style.display = menu.style.display === 'none' ? 'block' : 'none';
+        } else if (aria === 'Add a note') {
+            var dialog = document.querySelector('div[role="dialog"]');
+            dialog.innerHTML = '<textarea name="message" maxlength="300"></textarea>' +
+                '<button aria-label="Send invitation"><span>Send</span></button>';
+        } else if (aria === 'Send invitation' || aria === 'Send without a note' || aria === 'Send now') {
+            closeInviteModal();
+        } else if (aria === 'Next') {
+            var params = new URLSearchParams(location.search);
+            params.set('page', String(Number(params.get('page') || '1') + 1));
+            location.search = params.toString();
+        } else if (target.id === 'searchFilter_geoUrn') {
+            document.getElementById('location-panel').style.display = 'block';
+        } else if (aria === 'Apply current filter to show results') {
+            var selected = document.querySelector('#location-options [data-selected="true"]');
+            var p = new URLSearchParams(location.search);
+            if (selected) p.set('geoUrn', '["' + selected.getAttribute('data-urn') + '"]');
+            history.pushState({}, '', location.pathname + '?' + p.toString());
+            document.getElementById('location-panel').style.display = 'none';
+            document.querySelector('main').setAttribute('data-filtered', 'true');
+        }
+    });
+
+    document.addEventListener('click', function (event) {
+        var option = event.target.closest('#location-options span');
+        if (option) option.setAttribute('data-selected', 'true');
+    });
+
+    document.addEventListener('input', function (event) {
+        if (event.target.getAttribute('placeholder') !== 'Add a location') return;
+        var value = event.target.value.trim();
+        var options = document.getElementById('location-options');
+        setTimeout(function () {
+            var title = value.replace(/\w\S*/g, function (w) { return w[0].toUpperCase() + w.slice(1).toLowerCase(); });
+            options.innerHTML = value ? '<span role="option" data-urn="1000' + value.length + '">' + title + '</span>' : '';
+        }, 200);
+    });
+})();
@@ -0,0 +1,71 @@
+"""Measure how long `import updated` takes and check that no heavy dependency is loaded at import time.
+
+Runs the import in a fresh interpreter with `-X importtime`, several times, and keeps the fastest run:
+
+    python bench/import_time.py
+    python bench/import_time.py --module updated --runs 5 --max-ms 150
+
+Exits non-zero if the import fails, exceeds --max-ms, or pulls in one of the lazily imported packages.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that must only be imported on the code path that needs them
+LAZY_PACKAGES = ["selenium", "webdriver_manager", "gspread", "oauth2client", "requests", "urllib3", "sqlite3", "openpyxl"]
+
+def parse_importtime(stderr):
+    """Turn `-X importtime` output into a list of (module, self_us, cumulative_us, depth)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+def measure(module):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PACKAGE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import {module} failed")
+    return parse_importtime(result.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="updated")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time; the fastest run is reported")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--max-ms", type=float, help="Fail if the import takes longer than this")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [next((cumulative for name, _, cumulative, _ in entries if name == args.module), 0) for entries in runs]
+    best = runs[totals.index(min(totals))]
+    total_ms = min(totals) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms (fastest of {args.runs}, slowest {max(totals) / 1000:.1f} ms)\n")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for name, self_us, cumulative_us, _ in sorted(best, key=lambda e: -e[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+    loaded = sorted({name.split(".")[0] for name, _, _, _ in best} & set(LAZY_PACKAGES))
+    failed = False
+    if loaded:
+        print(f"\n[FAIL] imported at module load: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"\n[FAIL] {total_ms:.1f} ms exceeds the {args.max_ms:.1f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Drive the connector against the recorded fixtures and report wall time, WebDriver commands and sleep time.
+
+Every case is also checked against the outcome its fixture should produce (recorded in a scratch ledger); the
+script exits non-zero if any case does not match.
+
+Runs on a plain Linux box with a local Chrome/chromedriver and no network access:
+
+    python bench/run_bench.py
+    python bench/run_bench.py --remote http://localhost:4444 --search-limit 12 --json bench_output.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+
+import updated
+from ledger import (OutcomeLedger, OUTCOME_SENT, OUTCOME_PENDING, OUTCOME_ALREADY_CONNECTED, OUTCOME_FOLLOW_ONLY,
+                    OUTCOME_UNAVAILABLE)
+from server import start_server, PROFILE_FIXTURES
+
+NOTE = "Hi {name}, I enjoyed your recent post and would love to connect."
+
+# Outcome each profile fixture must leave in the ledger
+EXPECTED_OUTCOMES = {
+    "direct": OUTCOME_SENT,
+    "more-menu": OUTCOME_SENT,
+    "pending": OUTCOME_PENDING,
+    "connected": OUTCOME_ALREADY_CONNECTED,
+    "follow-only": OUTCOME_FOLLOW_ONLY,
+    "unavailable": OUTCOME_UNAVAILABLE,
+}
+
+# search.html serves three pages of ten cards; these two are already Pending on every page
+SEARCH_PAGES = 3
+SEARCH_PENDING = ["donald-knuth", "ken-thompson"]
+SEARCH_CONNECTABLE = SEARCH_PAGES * (10 - len(SEARCH_PENDING))
+
+class SleepMeter:
+    """Accumulate time.sleep calls, split into fixed pauses and WebDriverWait polling"""
+
+    def __init__(self):
+        self.fixed = 0.0
+        self.polling = 0.0
+        self._sleep = time.sleep
+
+    def __enter__(self):
+        time.sleep = self.sleep
+        return self
+
+    def __exit__(self, *exc):
+        time.sleep = self._sleep
+        return False
+
+    def sleep(self, seconds):
+        caller = sys._getframe(1).f_globals.get("__name__", "")
+        if caller.startswith("selenium"):
+            self.polling += seconds
+        else:
+            self.fixed += seconds
+        self._sleep(seconds)
+
+def make_driver(remote=None, headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1280,900")
+    if updated.lean_mode():
+        options.page_load_strategy = updated.config.get('Browser', 'page_load_strategy', fallback='eager')
+    if remote:
+        driver = webdriver.Remote(options=options, command_executor=remote)
+    else:
+        driver = webdriver.Chrome(options=options)
+    driver.set_script_timeout(max(updated.step_timeout(step) for step in updated.STEP_TIMEOUTS) + 5)
+    if updated.lean_mode():
+        updated.execute_cdp(driver, "Network.enable")
+        updated.execute_cdp(driver, "Network.setBlockedURLs", {"urls": updated.LEAN_BLOCK_PATTERNS})
+    return driver
+
+def measure(driver, label, fn, check, profiles=1):
+    """Time fn, then pass its result to check, which returns a description of what went wrong or ''"""
+    with SleepMeter() as sleeps, updated.command_counter(driver) as commands:
+        start = time.perf_counter()
+        result = fn()
+        wall = time.perf_counter() - start
+    return {
+        "case": label,
+        "profiles": profiles,
+        "wall_s": round(wall / profiles, 3),
+        "commands": round(commands.count / profiles, 1),
+        "sleep_s": round(sleeps.fixed / profiles, 3),
+        "poll_s": round(sleeps.polling / profiles, 3),
+        "check": check(result) or "ok",
+    }
+
+def check_profile(ledger, slug, url, sent):
+    expected = EXPECTED_OUTCOMES[slug]
+    entry = ledger.lookup(url)
+    outcome = entry["outcome"] if entry else None
+    if outcome != expected or bool(sent) != (expected == OUTCOME_SENT):
+        return f"expected {expected}, got {outcome} ({sent} sent)"
+    return ""
+
+def check_search(ledger, base_url, limit, sent):
+    problems = []
+    recorded = ledger.count_since(OUTCOME_SENT, 0)
+    if sent != limit or recorded != limit:
+        problems.append(f"expected {limit} sent, got {sent} ({recorded} in the ledger)")
+    processed = [f"{slug}-p{page}" for slug in SEARCH_PENDING for page in range(1, SEARCH_PAGES + 1)
+                 if ledger.lookup(f"{base_url}/in/{slug}-p{page}/") is not None]
+    if processed:
+        problems.append(f"pending cards processed: {', '.join(processed)}")
+    return "; ".join(problems)
+
+def run(driver, base_url, search_limit):
+    results = []
+    for slug in PROFILE_FIXTURES:
+        url = f"{base_url}/in/{slug}/"
+        ledger = OutcomeLedger(":memory:")
+        results.append(measure(driver, f"profile:{slug}",
+                               lambda: updated.send_connection_request_to_urls(driver, [url], NOTE, True, ledger=ledger),
+                               lambda sent: check_profile(ledger, slug, url, sent)))
+
+    resolved = {}
+    search_ledger = OutcomeLedger(":memory:")
+    def search_flow():
+        driver.get(updated.build_search_url("engineer", base_url=base_url))
+        resolved["geo_urn"] = updated.select_location(driver, "berlin")
+        return updated.send_connection_request(driver, limit=search_limit, letter=NOTE, include_notes=True, message_letter="",
+                                               ledger=search_ledger)
+    results.append(measure(driver, "search", search_flow, lambda sent: check_search(search_ledger, base_url, search_limit, sent),
+                           profiles=search_limit))
+
+    cached_ledger = OutcomeLedger(":memory:")
+    def cached_search_flow():
+        driver.get(updated.build_search_url("engineer", geo_urn=resolved["geo_urn"], base_url=base_url))
+        return updated.send_connection_request(driver, limit=search_limit, letter=NOTE, include_notes=True, message_letter="",
+                                               ledger=cached_ledger)
+    results.append(measure(driver, "search:cached-geo", cached_search_flow,
+                           lambda sent: check_search(cached_ledger, base_url, search_limit, sent), profiles=search_limit))
+    return results
+
+def print_table(results):
+    columns = ["case", "profiles", "wall_s", "commands", "sleep_s", "poll_s"]
+    print("\n" + "  ".join(f"{c:>22}" if i == 0 else f"{c:>9}" for i, c in enumerate(columns)) + "  check")
+    for row in results:
+        print("  ".join(f"{str(row[c]):>22}" if i == 0 else f"{str(row[c]):>9}" for i, c in enumerate(columns)) + f"  {row['check']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--remote", help="Remote WebDriver URL; defaults to a local chromedriver")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--search-limit", type=int, default=12, help="Connection requests to send in the search flow")
+    parser.add_argument("--lean", action="store_true", help="Use lean page loading (eager load strategy, request blocking)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+    if not 0 < args.search_limit <= SEARCH_CONNECTABLE:
+        parser.error(f"--search-limit must be between 1 and {SEARCH_CONNECTABLE}, the Connect cards in the search fixture")
+    updated.load_config()
+    if args.lean:
+        if not updated.config.has_section('Browser'):
+            updated.config.add_section('Browser')
+        updated.config.set('Browser', 'lean', 'true')
+
+    server, base_url = start_server()
+    driver = make_driver(args.remote, headless=not args.headed)
+    try:
+        results = run(driver, base_url, args.search_limit)
+    finally:
+        driver.quit()
+        server.shutdown()
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    failed = [row["case"] for row in results if row["check"] != "ok"]
+    if failed:
+        print(f"\n{len(failed)} case(s) did not produce the expected outcome: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Serve the recorded page fixtures over HTTP so the connector can be driven without a LinkedIn account"""
+import os
+import re
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Profile slugs with a recorded page; any other /in/<slug>/ is served the direct-Connect profile
+PROFILE_FIXTURES = ["direct", "more-menu", "pending", "follow-only", "connected", "unavailable"]
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def translate_path(self, path):
+        path = path.split("?", 1)[0]
+        match = re.match(r"^/in/([^/]+)/?$", path)
+        if match:
+            slug = match.group(1)
+            name = slug if slug in PROFILE_FIXTURES else "direct"
+            return os.path.join(FIXTURES_DIR, f"profile_{name}.html")
+        if path.startswith("/search/results/people"):
+            return os.path.join(FIXTURES_DIR, "search.html")
+        if path.startswith("/static/"):
+            return os.path.join(FIXTURES_DIR, os.path.basename(path))
+        return super().translate_path(path)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(host="127.0.0.1", port=0):
+    """Start the fixture server on a background thread and return (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    server, base_url = start_server(port=8765)
+    print(f"Serving fixtures at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
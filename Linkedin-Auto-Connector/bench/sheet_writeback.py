@@ -0,0 +1,65 @@
+"""Exercise the sheet status write-back against the fake gspread client and count API calls.
+
+Reads a generated sheet of profile URLs, records a simulated outcome for every row in a scratch ledger and
+writes the statuses back, then checks the sheet against the ledger. Needs no Google account or browser:
+
+    python bench/sheet_writeback.py --rows 2000 --flush-every 25
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_gspread import FakeClient, FakeWorksheet
+from ledger import OutcomeLedger, OUTCOME_SENT, OUTCOME_PENDING, OUTCOME_FOLLOW_ONLY, OUTCOME_FAILED
+from sources import SheetSource, SheetStatusWriter, STATUS_HEADERS, iter_profile_rows
+
+SIMULATED = [(OUTCOME_SENT, "without note"), (OUTCOME_SENT, "with note"), (OUTCOME_PENDING, "Profile state on load"),
+             (OUTCOME_FOLLOW_ONLY, "Profile state on load"), (OUTCOME_FAILED, "TimeoutException")]
+
+def build_sheet(rows, grid_rows=1000):
+    data = [["Name", "Profile"]]
+    for i in range(rows):
+        url = f"https://www.linkedin.com/in/person-{i}/" if i % 17 else "not a profile"
+        data.append([f"Person {i}", url])
+    # A real sheet's grid keeps its blank rows below the data (1000 rows for a new sheet)
+    data += [[] for _ in range(grid_rows - len(data))]
+    return FakeWorksheet(data, col_count=2)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--flush-every", type=int, default=25)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--grid-rows", type=int, default=1000, help="rows in the sheet's grid, blank below the data")
+    args = parser.parse_args()
+
+    worksheet = build_sheet(args.rows, args.grid_rows)
+    source = SheetSource("https://docs.google.com/spreadsheets/d/fake", "Profile", None, args.page_size, client=FakeClient(worksheet))
+    ledger = OutcomeLedger(":memory:")
+    writer = SheetStatusWriter(source, args.flush_every).open()
+    processed = {}
+    try:
+        for n, (row, url) in enumerate(iter_profile_rows(source)):
+            outcome, reason = SIMULATED[n % len(SIMULATED)]
+            ledger.record(url, outcome, reason)
+            writer.record(row, outcome, reason)
+            processed[row] = url
+    finally:
+        writer.close()
+
+    status_column = source.column_index + 1
+    assert [worksheet.cell(1, status_column + i) for i in range(3)] == STATUS_HEADERS
+    mismatches = 0
+    for row, url in processed.items():
+        entry = ledger.lookup(url)
+        if [worksheet.cell(row, status_column), worksheet.cell(row, status_column + 2)] != [entry["outcome"], entry["reason"]]:
+            mismatches += 1
+    print(f"{len(processed)} profiles written back over {args.rows} rows")
+    print(f"API calls: {dict(worksheet.calls)} ({writer.flushes} flushes of up to {args.flush_every} rows)")
+    print(f"Rows not matching the ledger: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
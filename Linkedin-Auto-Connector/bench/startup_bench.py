@@ -0,0 +1,71 @@
+"""Compare cold and warm startup: browser launch + login + first target page.
+
+Cold starts use an empty browser profile and no cached session check; warm starts reuse the profile and the
+cached li_at verification from the previous round. Each start must reach the logged-in site (the global search
+bar on the target page). Needs a valid li_at in setup.ini and network access:
+
+    python bench/startup_bench.py --rounds 3 --target https://www.linkedin.com/in/some-profile/
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import updated
+
+def timed_start(li_at, target):
+    started = time.perf_counter()
+    driver = updated.setup_driver()
+    mode = updated.login(driver, li_at)
+    logged_in = time.perf_counter()
+    driver.get(target)
+    updated.wait_for_page_ready(driver)
+    try:
+        # Only the logged-in site has the global search bar; the authwall would look just as "ready"
+        updated.locate(driver, "global_nav", "page_load", "present")
+    except Exception:
+        raise SystemExit(f"{mode} start did not end up logged in: {driver.current_url}")
+    ready = time.perf_counter()
+    updated.quit_driver(driver)
+    return mode, logged_in - started, ready - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--target", default="https://www.linkedin.com/mynetwork/")
+    args = parser.parse_args()
+
+    updated.load_config()
+    li_at = updated.config.get('LinkedIn', 'li_at')
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    # Work on a copy of the config so the benchmark never rewrites the real setup.ini
+    updated.config_file = os.path.join(workdir, "setup.ini")
+    if not updated.config.has_section('Session'):
+        updated.config.add_section('Session')
+    results = []
+    try:
+        for round_number in range(args.rounds):
+            profile_dir = os.path.join(workdir, f"profile-{round_number}")
+            updated.config.set('Session', 'user_data_dir', profile_dir)
+            updated.config.set('LinkedIn', 'li_at_verified_at', '0')
+            updated.config.set('LinkedIn', 'li_at_in_profile', '')
+            results.append(("cold",) + timed_start(li_at, args.target))
+            results.append(("warm",) + timed_start(li_at, args.target))
+            if results[-1][1] != "warm":
+                print(f"Round {round_number + 1}: the second start logged in with {results[-1][1]}, not from the profile")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'start':>6} {'login mode':>12} {'login s':>9} {'first page s':>13}")
+    for kind, mode, login_s, ready_s in results:
+        print(f"{kind:>6} {mode:>12} {login_s:>9.2f} {ready_s:>13.2f}")
+    for kind in ("cold", "warm"):
+        rows = [r for r in results if r[0] == kind]
+        print(f"{kind} mean: login {sum(r[2] for r in rows) / len(rows):.2f}s, first page {sum(r[3] for r in rows) / len(rows):.2f}s")
+
+if __name__ == "__main__":
+    main()
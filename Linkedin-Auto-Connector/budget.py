@@ -0,0 +1,125 @@
+import time
+
+from ledger import OUTCOME_SENT
+
+# Limits LinkedIn can report while sending invitations
+LIMIT_WEEKLY = "weekly-limit"
+LIMIT_RESTRICTED = "restricted"
+LIMIT_NOTES_EXHAUSTED = "notes-exhausted"
+
+# Reasons stored with a "sent" outcome, so notes can be counted separately
+SENT_WITH_NOTE = "with note"
+SENT_WITHOUT_NOTE = "without note"
+
+# Hours after LinkedIn reported a limit before it is tried again.
+# Override in the [Budget] section of setup.ini, e.g. `cooldown_weekly_limit = 48`.
+DEFAULT_COOLDOWN_HOURS = {
+    LIMIT_WEEKLY: 24,
+    LIMIT_RESTRICTED: 168,
+    LIMIT_NOTES_EXHAUSTED: 720,
+}
+
+DAY = 86400
+
+class InvitationLimitReached(Exception):
+    """LinkedIn reported a limit that ends the run"""
+
+    def __init__(self, kind, reason=""):
+        super().__init__(f"{kind}: {reason}" if reason else kind)
+        self.kind = kind
+        self.reason = reason
+
+class InvitationBudget:
+    """Decides, from the ledger's history, whether another invitation (and another note) may be sent.
+
+    Ceilings are counted over rolling windows of sent outcomes. Limits LinkedIn itself reported are remembered in
+    the ledger and block sending until their cooldown has passed, so later runs do not re-discover them one page
+    load at a time.
+    """
+
+    def __init__(self, ledger, daily=None, weekly=None, notes_monthly=None, on_notes_exhausted="no-note", cooldown_hours=None):
+        self.ledger = ledger
+        self.daily = daily
+        self.weekly = weekly
+        self.notes_monthly = notes_monthly
+        self.on_notes_exhausted = on_notes_exhausted
+        self.cooldown_hours = cooldown_hours if cooldown_hours is not None else dict(DEFAULT_COOLDOWN_HOURS)
+
+    def sent_since(self, seconds, now=None, reason=None):
+        now = time.time() if now is None else now
+        return self.ledger.count_since(OUTCOME_SENT, now - seconds, reason)
+
+    def active_limit(self, kind, now=None):
+        """The stored limit of this kind if it is still inside its cooldown, else None"""
+        hit = self.ledger.last_limit(kind)
+        if hit is None:
+            return None
+        now = time.time() if now is None else now
+        if now - hit["hit_at"] >= self.cooldown_hours.get(kind, 24) * 3600:
+            return None
+        return hit
+
+    def remaining(self, now=None):
+        """Invitations left under the configured ceilings, or None if no ceiling is set"""
+        left = []
+        if self.daily is not None:
+            left.append(self.daily - self.sent_since(DAY, now))
+        if self.weekly is not None:
+            left.append(self.weekly - self.sent_since(7 * DAY, now))
+        return max(0, min(left)) if left else None
+
+    def stop_reason(self, uses_notes=True, now=None):
+        """Why no further invitation may be sent right now, or None.
+
+        Running out of personalized invitations only stops (with on_notes_exhausted = stop) a run that sends notes.
+        """
+        for kind in (LIMIT_RESTRICTED, LIMIT_WEEKLY):
+            hit = self.active_limit(kind, now)
+            if hit is not None:
+                return f"LinkedIn reported {kind} ({hit['reason'] or 'no details'})"
+        if self.daily is not None and self.sent_since(DAY, now) >= self.daily:
+            return f"Daily ceiling of {self.daily} invitations reached"
+        if self.weekly is not None and self.sent_since(7 * DAY, now) >= self.weekly:
+            return f"Weekly ceiling of {self.weekly} invitations reached"
+        if uses_notes and self.on_notes_exhausted == "stop" and not self.notes_allowed(now):
+            return "Personalized invitations exhausted"
+        return None
+
+    def notes_allowed(self, now=None):
+        if self.active_limit(LIMIT_NOTES_EXHAUSTED, now) is not None:
+            return False
+        if self.notes_monthly is not None and self.sent_since(30 * DAY, now, SENT_WITH_NOTE) >= self.notes_monthly:
+            return False
+        return True
+
+    def hit(self, kind, reason=""):
+        self.ledger.record_limit(kind, reason)
+
+    def describe(self, now=None):
+        parts = []
+        if self.daily is not None:
+            parts.append(f"{self.sent_since(DAY, now)}/{self.daily} today")
+        if self.weekly is not None:
+            parts.append(f"{self.sent_since(7 * DAY, now)}/{self.weekly} this week")
+        if self.notes_monthly is not None:
+            parts.append(f"{self.sent_since(30 * DAY, now, SENT_WITH_NOTE)}/{self.notes_monthly} notes this month")
+        return ", ".join(parts) or "no ceilings set"
+
+def budget_from_config(config, ledger, section="Budget"):
+    def optional_int(key):
+        value = config.get(section, key, fallback="").strip()
+        return int(value) if value else None
+
+    cooldown_hours = dict(DEFAULT_COOLDOWN_HOURS)
+    if config.has_section(section):
+        for key, value in config.items(section):
+            if key.startswith("cooldown_"):
+                cooldown_hours[key[len("cooldown_"):].replace("_", "-")] = float(value)
+    return InvitationBudget(
+        ledger,
+        daily=optional_int("daily"),
+        weekly=optional_int("weekly"),
+        notes_monthly=optional_int("notes_monthly"),
+        on_notes_exhausted=config.get(section, "on_notes_exhausted", fallback="no-note").strip().lower(),
+        cooldown_hours=cooldown_hours,
+    )
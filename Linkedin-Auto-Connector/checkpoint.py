@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import time
+
+class ProgressJournal:
+    """Append-only JSONL journal of a batch's progress, so an interrupted run can pick up where it stopped.
+
+    Each record holds the position reached (a source row or a search page), the running success count and the
+    limit. A final {"finished": true} record marks the batch complete, after which the next run starts afresh.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.last = self._load_last()
+        self._file = open(path, "a")
+        if self._file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Terminate a torn line so the next record starts cleanly
+                    self._file.write("\n")
+
+    @classmethod
+    def for_run(cls, directory, flow, *identity):
+        """Journal whose file name is derived from the flow and whatever identifies the batch (source, limit, ...)"""
+        digest = hashlib.sha1(json.dumps([flow] + [str(part) for part in identity]).encode()).hexdigest()[:12]
+        return cls(os.path.join(directory, f"{flow}-{digest}.jsonl"))
+
+    def _load_last(self):
+        if not os.path.exists(self.path):
+            return None
+        last = None
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    last = json.loads(line)
+                except ValueError:
+                    # A torn line from a crash mid-write; the record before it is still valid
+                    continue
+        return last
+
+    def resume_point(self):
+        if self.last is None or self.last.get("finished"):
+            return None
+        return self.last
+
+    def record(self, **progress):
+        entry = dict(progress, ts=time.time())
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.last = entry
+
+    def finish(self, **summary):
+        self.record(finished=True, **summary)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,43 @@
+import json
+import os
+from urllib.parse import urlparse, parse_qs
+
+def location_key(location):
+    """Case- and whitespace-insensitive key, so 'new  York' and 'New York' share an entry"""
+    return " ".join(location.lower().split())
+
+def geo_urn_from_url(url):
+    """The first geoUrn facet of a search results URL (?geoUrn=["103644278"]), or None"""
+    values = parse_qs(urlparse(url).query).get("geoUrn")
+    if not values:
+        return None
+    try:
+        urns = json.loads(values[0])
+    except ValueError:
+        return None
+    return str(urns[0]) if urns else None
+
+class GeoUrnCache:
+    """Persistent map from the location text a user typed to the geoUrn LinkedIn resolved it to"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, location):
+        return self.entries.get(location_key(location))
+
+    def put(self, location, geo_urn):
+        self.entries[location_key(location)] = geo_urn
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,224 @@
+import json
+import os
+import time
+
+# Logical stages a WebDriver command can be attributed to
+STAGES = ["login", "navigate", "locate-connect", "add-note", "send", "confirm"]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+class CommandTracer:
+    """Records every WebDriver command with its latency, tagged with the current stage and profile.
+
+    Commands are appended to a JSONL trace as they happen; summary() aggregates per stage and per profile.
+    """
+
+    def __init__(self, trace_path=None):
+        self.trace_path = trace_path
+        self.records = []
+        self.current_stage = None
+        self.current_profile = None
+        self.stage_started = None
+        # profile -> stage -> wall-clock ms spent in that stage (includes waiting between commands)
+        self.stage_time = {}
+        self.memory_samples = []
+        # stage -> retries taken there (see retries.StageRetries)
+        self.retries = {}
+        self._driver = None
+        self._execute = None
+        self._file = None
+        if trace_path:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+            self._file = open(trace_path, "a")
+
+    def attach(self, driver):
+        self._driver = driver
+        self._execute = driver.execute
+        def traced_execute(driver_command, params=None):
+            start = time.perf_counter()
+            error = None
+            try:
+                return self._execute(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self.record(driver_command, (time.perf_counter() - start) * 1000, error)
+        driver.execute = traced_execute
+        driver.command_tracer = self
+        return driver
+
+    def detach(self):
+        if self._driver is not None:
+            self._driver.execute = self._execute
+            del self._driver.command_tracer
+            self._driver = None
+
+    def record(self, command, elapsed_ms, error=None):
+        entry = {
+            "ts": time.time(),
+            "command": command,
+            "stage": self.current_stage,
+            "profile": self.current_profile,
+            "ms": round(elapsed_ms, 3),
+        }
+        if error:
+            entry["error"] = error
+        self.records.append(entry)
+        self.write(entry)
+
+    def write(self, entry):
+        if self._file is not None:
+            self._file.write(json.dumps(entry) + "\n")
+
+    def event(self, kind, data):
+        """Write a non-command record (navigation metrics, memory samples, ...) to the trace"""
+        entry = dict(data, type=kind, ts=time.time(), profile=self.current_profile)
+        if kind == "memory":
+            self.memory_samples.append(entry)
+        elif kind == "retry":
+            self.retries[data["stage"]] = self.retries.get(data["stage"], 0) + 1
+        self.write(entry)
+
+    def set_stage(self, stage):
+        self._close_stage()
+        self.current_stage = stage
+        self.stage_started = time.perf_counter()
+
+    def begin_profile(self, url):
+        self.end_profile()
+        self.current_profile = url
+
+    def end_profile(self):
+        self._close_stage()
+        self.current_stage = None
+        self.current_profile = None
+
+    def _close_stage(self):
+        if self.current_stage is not None and self.stage_started is not None:
+            elapsed = (time.perf_counter() - self.stage_started) * 1000
+            stages = self.stage_time.setdefault(self.current_profile, {})
+            stages[self.current_stage] = stages.get(self.current_stage, 0.0) + elapsed
+        self.stage_started = None
+
+    def summary(self):
+        self._close_stage()
+        self.stage_started = time.perf_counter() if self.current_stage else None
+        stages = {}
+        for entry in self.records:
+            stages.setdefault(entry["stage"] or "untagged", []).append(entry["ms"])
+        per_stage = {}
+        for stage, latencies in stages.items():
+            profile_times = [t[stage] for p, t in self.stage_time.items() if p is not None and stage in t]
+            per_stage[stage] = {
+                "commands": len(latencies),
+                "command_ms_total": round(sum(latencies), 1),
+                "command_ms_p50": round(percentile(latencies, 50), 1),
+                "command_ms_p95": round(percentile(latencies, 95), 1),
+                "profile_ms_p50": round(percentile(profile_times, 50), 1),
+                "profile_ms_p95": round(percentile(profile_times, 95), 1),
+            }
+        per_profile = {}
+        for entry in self.records:
+            if entry["profile"] is None:
+                continue
+            profile = per_profile.setdefault(entry["profile"], {"commands": 0, "command_ms": 0.0})
+            profile["commands"] += 1
+            profile["command_ms"] = round(profile["command_ms"] + entry["ms"], 3)
+        for url, times in self.stage_time.items():
+            if url is None:
+                continue
+            profile = per_profile.setdefault(url, {"commands": 0, "command_ms": 0.0})
+            profile["stage_ms"] = {stage: round(ms, 1) for stage, ms in times.items()}
+        totals = [sum(p.get("stage_ms", {}).values()) for p in per_profile.values()]
+        summary = {
+            "commands": len(self.records),
+            "profiles": len(per_profile),
+            "profile_ms_p50": round(percentile(totals, 50), 1),
+            "profile_ms_p95": round(percentile(totals, 95), 1),
+            "stages": per_stage,
+            "per_profile": per_profile,
+        }
+        if self.retries:
+            summary["retries"] = dict(self.retries)
+        if self.memory_samples:
+            first, last = self.memory_samples[0], self.memory_samples[-1]
+            summary["memory"] = {
+                "samples": len(self.memory_samples),
+                "heap_mb_first": first["heapUsedMb"],
+                "heap_mb_last": last["heapUsedMb"],
+                "heap_mb_peak": max(s["heapUsedMb"] for s in self.memory_samples),
+                "nodes_peak": max(s["nodes"] for s in self.memory_samples),
+                "recycled": sum(1 for s in self.memory_samples if s.get("action")),
+            }
+        return summary
+
+    def write_summary(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_prometheus(self, path):
+        """Write the per-stage summary in the Prometheus textfile-collector format"""
+        lines = [
+            "# HELP linkedin_connector_commands_total WebDriver commands issued per stage.",
+            "# TYPE linkedin_connector_commands_total counter",
+        ]
+        stages = self.summary()["stages"]
+        for stage, data in stages.items():
+            lines.append(f'linkedin_connector_commands_total{{stage="{stage}"}} {data["commands"]}')
+        lines += [
+            "# HELP linkedin_connector_command_latency_ms WebDriver command latency per stage.",
+            "# TYPE linkedin_connector_command_latency_ms summary",
+        ]
+        for stage, data in stages.items():
+            lines.append(f'linkedin_connector_command_latency_ms{{stage="{stage}",quantile="0.5"}} {data["command_ms_p50"]}')
+            lines.append(f'linkedin_connector_command_latency_ms{{stage="{stage}",quantile="0.95"}} {data["command_ms_p95"]}')
+            lines.append(f'linkedin_connector_command_latency_ms_sum{{stage="{stage}"}} {data["command_ms_total"]}')
+            lines.append(f'linkedin_connector_command_latency_ms_count{{stage="{stage}"}} {data["commands"]}')
+        # Write then rename so the collector never reads a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self.end_profile()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# Helpers the flows call unconditionally; they do nothing when no tracer or run log (runlog.RunLog) is attached
+
+def mark_stage(driver, stage):
+    tracer = getattr(driver, "command_tracer", None)
+    if tracer is not None:
+        tracer.set_stage(stage)
+    run_log = getattr(driver, "run_log", None)
+    if run_log is not None:
+        run_log.set_stage(stage)
+
+def begin_profile(driver, url):
+    tracer = getattr(driver, "command_tracer", None)
+    if tracer is not None:
+        tracer.begin_profile(url)
+    run_log = getattr(driver, "run_log", None)
+    if run_log is not None:
+        run_log.begin_profile(url)
+
+def end_profile(driver):
+    tracer = getattr(driver, "command_tracer", None)
+    if tracer is not None:
+        tracer.end_profile()
+    run_log = getattr(driver, "run_log", None)
+    if run_log is not None:
+        run_log.end_profile()
+
+def record_event(driver, kind, data):
+    tracer = getattr(driver, "command_tracer", None)
+    if tracer is not None:
+        tracer.event(kind, data)
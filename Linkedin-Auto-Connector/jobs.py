@@ -0,0 +1,97 @@
+import json
+import os
+import time
+from configparser import ConfigParser, Error as ConfigError
+
+FLOW_LIST = "list"
+FLOW_SEARCH = "search"
+
+DEGREES = ("1st", "2nd", "3rd")
+
+class JobError(ValueError):
+    pass
+
+class Job:
+    """One campaign from a job file: a profile list (Google Sheet or local file) or a people search, with its
+    note template and limit"""
+
+    def __init__(self, name, flow, limit, note="", source="", column="", credentials="", keyword="", location="", degree="2nd"):
+        self.name = name
+        self.flow = flow
+        self.limit = limit
+        self.note = note
+        self.source = source
+        self.column = column
+        self.credentials = credentials
+        self.keyword = keyword
+        self.location = location
+        self.degree = degree
+
+    def describe(self):
+        if self.flow == FLOW_LIST:
+            return f"{self.source} ({self.column}), limit {self.limit}"
+        location = f" in {self.location}" if self.location else ""
+        return f"search '{self.keyword}'{location}, {self.degree} degree, limit {self.limit}"
+
+def parse_job(name, section):
+    """Job from one job-file section; raises JobError naming the section for anything missing or invalid"""
+    source = section.get("source", "").strip()
+    keyword = section.get("keyword", "").strip()
+    if bool(source) == bool(keyword):
+        raise JobError(f"[{name}] needs either source (a profile list) or keyword (a search), not {'both' if source else 'neither'}")
+    try:
+        limit = section.getint("limit")
+    except ValueError:
+        raise JobError(f"[{name}] limit must be a whole number")
+    if limit is None or limit <= 0:
+        raise JobError(f"[{name}] needs a positive limit")
+    note = section.get("note", "").strip()
+    if source:
+        column = section.get("column", "").strip()
+        if not column:
+            raise JobError(f"[{name}] needs the column that holds the profile URLs")
+        credentials = section.get("credentials", "").strip()
+        if source.startswith("http") and not credentials:
+            raise JobError(f"[{name}] needs credentials (a service account JSON file) to read a Google Sheet")
+        return Job(name, FLOW_LIST, limit, note, source=source, column=column, credentials=credentials)
+    degree = section.get("degree", "2nd").strip().lower()
+    if degree not in DEGREES:
+        raise JobError(f"[{name}] degree must be one of {', '.join(DEGREES)}")
+    return Job(name, FLOW_SEARCH, limit, note, keyword=keyword, location=section.get("location", "").strip(), degree=degree)
+
+def load_jobs(path):
+    """Jobs from an INI file, one section per job, in file order; sections with enabled = false are left out.
+
+    Every section is checked before any job runs, and all problems are reported together.
+    """
+    if not os.path.exists(path):
+        raise JobError(f"Job file not found: {path}")
+    parser = ConfigParser(interpolation=None)
+    try:
+        parser.read(path)
+    except ConfigError as e:
+        raise JobError(f"Could not read {path}: {e}")
+    jobs, problems = [], []
+    for name in parser.sections():
+        section = parser[name]
+        try:
+            if not section.getboolean("enabled", fallback=True):
+                continue
+            jobs.append(parse_job(name, section))
+        except JobError as e:
+            problems.append(str(e))
+        except ValueError as e:
+            problems.append(f"[{name}] {e}")
+    if problems:
+        raise JobError("\n".join(problems))
+    if not jobs:
+        raise JobError(f"No enabled jobs in {path}")
+    return jobs
+
+def write_job_reports(directory, reports):
+    """Save the per-job reports of a runner invocation as reports/jobs-<timestamp>.json"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"jobs-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2)
+    return path
@@ -0,0 +1,135 @@
+import time
+from urllib.parse import urlparse, unquote
+
+# Outcomes recorded per profile
+OUTCOME_SENT = "sent"
+OUTCOME_PENDING = "pending"
+OUTCOME_ALREADY_CONNECTED = "already-connected"
+OUTCOME_FOLLOW_ONLY = "follow-only"
+OUTCOME_UNAVAILABLE = "unavailable"
+OUTCOME_NOT_CONFIRMED = "not-confirmed"
+OUTCOME_FAILED = "failed"
+OUTCOMES = (OUTCOME_SENT, OUTCOME_PENDING, OUTCOME_ALREADY_CONNECTED, OUTCOME_FOLLOW_ONLY, OUTCOME_UNAVAILABLE,
+            OUTCOME_NOT_CONFIRMED, OUTCOME_FAILED)
+
+# Days to wait before a profile with this outcome is tried again; None means never.
+# Override per outcome in the [Ledger] section of setup.ini, e.g. `retry_unavailable = 7` or `retry_failed = never`.
+DEFAULT_RETRY_DAYS = {
+    OUTCOME_SENT: None,
+    OUTCOME_PENDING: None,
+    OUTCOME_ALREADY_CONNECTED: None,
+    OUTCOME_FOLLOW_ONLY: 30,
+    OUTCOME_UNAVAILABLE: 30,
+    OUTCOME_NOT_CONFIRMED: 1,
+    OUTCOME_FAILED: 0,
+}
+
+def normalize_profile_url(url):
+    """Return the canonical https://www.linkedin.com/in/<slug>/ form, or None if url is not a profile URL"""
+    if not url:
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    parts = [p for p in parsed.path.split("/") if p]
+    if not parsed.netloc.lower().endswith("linkedin.com") or len(parts) < 2 or parts[0] != "in":
+        return None
+    return f"https://www.linkedin.com/in/{unquote(parts[1]).lower()}/"
+
+def profile_id(url):
+    """Stable key for a profile: the lower-cased /in/ slug, falling back to the stripped URL"""
+    normalized = normalize_profile_url(url)
+    if normalized is None:
+        return url.strip().rstrip("/").lower()
+    return normalized.rstrip("/").rsplit("/", 1)[1]
+
+def retry_policy_from_config(config, section="Ledger"):
+    policy = dict(DEFAULT_RETRY_DAYS)
+    if config.has_section(section):
+        for key, value in config.items(section):
+            if key.startswith("retry_"):
+                outcome = key[len("retry_"):].replace("_", "-")
+                policy[outcome] = None if value.strip().lower() == "never" else float(value)
+    return policy
+
+class OutcomeLedger:
+    """Persistent record of the last outcome for every profile the tool has processed"""
+
+    def __init__(self, path="ledger.db", retry_days=None):
+        self.path = path
+        self.retry_days = retry_days if retry_days is not None else dict(DEFAULT_RETRY_DAYS)
+        import sqlite3
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outcomes ("
+            " profile_id TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " outcome TEXT NOT NULL,"
+            " reason TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        # Budget queries count recent outcomes of one kind
+        self.conn.execute("CREATE INDEX IF NOT EXISTS outcomes_by_time ON outcomes (outcome, updated_at)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS limits ("
+            " kind TEXT PRIMARY KEY,"
+            " reason TEXT,"
+            " hit_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def lookup(self, url):
+        row = self.conn.execute(
+            "SELECT url, outcome, reason, updated_at FROM outcomes WHERE profile_id = ?", (profile_id(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"url": row[0], "outcome": row[1], "reason": row[2], "updated_at": row[3]}
+
+    def should_skip(self, url, now=None):
+        """True if the profile has an outcome that is still inside its retry window"""
+        entry = self.lookup(url)
+        if entry is None:
+            return False
+        days = self.retry_days.get(entry["outcome"], 0)
+        if days is None:
+            return True
+        now = time.time() if now is None else now
+        return now - entry["updated_at"] < days * 86400
+
+    def record(self, url, outcome, reason=""):
+        self.conn.execute(
+            "INSERT INTO outcomes (profile_id, url, outcome, reason, updated_at) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(profile_id) DO UPDATE SET"
+            " url = excluded.url, outcome = excluded.outcome, reason = excluded.reason, updated_at = excluded.updated_at",
+            (profile_id(url), url, outcome, reason, time.time()),
+        )
+        self.conn.commit()
+
+    def count_since(self, outcome, since, reason=None):
+        """Number of profiles whose last outcome is outcome, recorded at or after since (epoch seconds)"""
+        query = "SELECT COUNT(*) FROM outcomes WHERE outcome = ? AND updated_at >= ?"
+        params = [outcome, since]
+        if reason is not None:
+            query += " AND reason = ?"
+            params.append(reason)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def record_limit(self, kind, reason=""):
+        """Remember that LinkedIn showed a limit or restriction of this kind"""
+        self.conn.execute(
+            "INSERT INTO limits (kind, reason, hit_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(kind) DO UPDATE SET reason = excluded.reason, hit_at = excluded.hit_at",
+            (kind, reason, time.time()),
+        )
+        self.conn.commit()
+
+    def last_limit(self, kind):
+        row = self.conn.execute("SELECT reason, hit_at FROM limits WHERE kind = ?", (kind,)).fetchone()
+        if row is None:
+            return None
+        return {"reason": row[0], "hit_at": row[1]}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,227 @@
+import json
+import os
+import sys
+import time
+
+# Values match selenium's By constants, so strategies can be passed straight to find_elements
+XPATH = "xpath"
+CSS = "css selector"
+ID = "id"
+
+# Alternatives for every logical element the flows touch, in their initial order of preference
+LOCATORS = {
+    "global_nav": [
+        (ID, "global-nav-typeahead"),
+        (CSS, "input.search-global-typeahead__input"),
+    ],
+    "login_username": [
+        (ID, "username"),
+        (CSS, "input[name='session_key']"),
+    ],
+    "login_password": [
+        (ID, "password"),
+        (CSS, "input[name='session_password']"),
+    ],
+    "login_submit": [
+        (XPATH, "//button[@type='submit']"),
+        (CSS, "button[data-litms-control-urn='login-submit']"),
+    ],
+    "verification_pin": [
+        (ID, "input__email_verification_pin"),
+        (CSS, "input[name='pin']"),
+    ],
+    "verification_submit": [
+        (ID, "email-pin-submit-button"),
+        (XPATH, "//button[@type='submit']"),
+    ],
+    "connect_button": [
+        (XPATH, "//button[.//span[text()='Connect'] and not(@disabled)]"),
+        (CSS, "main button[aria-label^='Invite'][aria-label$='to connect']"),
+    ],
+    "more_button": [
+        (XPATH, "//button[.//span[normalize-space()='More']]"),
+        (CSS, "main button[aria-label='More actions']"),
+    ],
+    "more_menu_connect": [
+        (XPATH, "//div[@role='menu']//span[text()='Connect']/ancestor::*[@role='menuitem' or @role='button'][1]"),
+        (CSS, "div[role='menu'] [aria-label^='Invite'][aria-label$='to connect']"),
+        (XPATH, "//div[contains(@class,'artdeco-dropdown__content')]//*[@role='button'][.//span[text()='Connect']]"),
+    ],
+    "dialog": [
+        (XPATH, "//div[@role='dialog']"),
+        (CSS, "div.artdeco-modal"),
+    ],
+    "add_note": [
+        (CSS, "button[aria-label='Add a note']"),
+        (XPATH, "//div[@role='dialog']//button[.//span[text()='Add a note']]"),
+    ],
+    "note_textarea": [
+        (CSS, "textarea[name='message']"),
+        (CSS, "div[role='dialog'] textarea"),
+    ],
+    "send_invitation": [
+        (CSS, "button[aria-label='Send invitation']"),
+        (XPATH, "//div[@role='dialog']//button[.//span[text()='Send']]"),
+    ],
+    "send_without_note": [
+        (CSS, "button[aria-label='Send without a note']"),
+        (CSS, "button[aria-label='Send now']"),
+        (XPATH, "//div[@role='dialog']//button[.//span[text()='Send without a note' or text()='Send']]"),
+    ],
+    "next_page": [
+        (CSS, "button[aria-label='Next']"),
+        (XPATH, "//button[.//span[text()='Next']]"),
+    ],
+    "location_filter": [
+        (ID, "searchFilter_geoUrn"),
+        (XPATH, "//button[.//text()[normalize-space()='Locations']]"),
+    ],
+    "location_input": [
+        (XPATH, "//input[@placeholder='Add a location']"),
+        (CSS, "input[aria-label='Add a location']"),
+    ],
+    "apply_filter": [
+        (XPATH, "//button[@aria-label='Apply current filter to show results']"),
+        (XPATH, "//button[.//span[text()='Show results']]"),
+    ],
+}
+
+# A strategy with at least this many tries and no success is reported as dead
+DEAD_AFTER_TRIES = 5
+
+def strategy_key(strategy):
+    return f"{strategy[0]}={strategy[1]}"
+
+class LocatorRegistry:
+    """Central table of locator strategies that learns which one works and tries it first.
+
+    Every lookup records, per strategy, whether it matched and how long the find took. Strategies are ordered by
+    smoothed success rate, then by mean latency, and the statistics are persisted between runs.
+    """
+
+    def __init__(self, stats_path=None, definitions=None):
+        self.definitions = definitions if definitions is not None else LOCATORS
+        self.load(stats_path)
+
+    def load(self, stats_path):
+        """Point the registry at a statistics file and read what earlier runs learned"""
+        self.stats_path = stats_path
+        self.stats = {}
+        if stats_path and os.path.exists(stats_path):
+            with open(stats_path) as f:
+                self.stats = json.load(f)
+
+    def _stat(self, name, strategy):
+        return self.stats.setdefault(name, {}).setdefault(strategy_key(strategy), {"tries": 0, "successes": 0, "total_ms": 0.0})
+
+    def _score(self, name, strategy):
+        stat = self.stats.get(name, {}).get(strategy_key(strategy))
+        if stat is None or stat["tries"] == 0:
+            return (-0.5, 0.0)
+        rate = (stat["successes"] + 1) / (stat["tries"] + 2)
+        mean_ms = stat["total_ms"] / stat["tries"]
+        return (-rate, mean_ms)
+
+    def ordered(self, name):
+        # sorted() is stable, so untried strategies keep their declared order
+        return sorted(self.definitions[name], key=lambda strategy: self._score(name, strategy))
+
+    def best(self, name):
+        """The (by, value) pair currently preferred for name, for use in expected_conditions"""
+        return self.ordered(name)[0]
+
+    def record(self, name, strategy, success, elapsed_ms):
+        stat = self._stat(name, strategy)
+        stat["tries"] += 1
+        stat["successes"] += 1 if success else 0
+        stat["total_ms"] = round(stat["total_ms"] + elapsed_ms, 3)
+
+    def find(self, driver, name, timeout, state="present"):
+        """Wait up to timeout for any strategy to yield an element in the given state.
+
+        state is "present", "visible" or "clickable". Each poll tries the strategies in learned order and stops at
+        the first match, so once the winner is first a lookup costs a single find command.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+        order = self.ordered(name)
+        latency = {}
+
+        def matches(element):
+            if state == "present":
+                return True
+            if not element.is_displayed():
+                return False
+            return state == "visible" or element.is_enabled()
+
+        def probe(d):
+            for strategy in order:
+                start = time.perf_counter()
+                elements = d.find_elements(*strategy)
+                latency[strategy] = (time.perf_counter() - start) * 1000
+                for element in elements:
+                    if matches(element):
+                        for tried in order[:order.index(strategy)]:
+                            self.record(name, tried, False, latency.get(tried, 0.0))
+                        self.record(name, strategy, True, latency[strategy])
+                        return element
+            return False
+
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.1,
+                                 ignored_exceptions=[StaleElementReferenceException]).until(probe)
+        except TimeoutException:
+            for strategy in order:
+                self.record(name, strategy, False, latency.get(strategy, 0.0))
+            raise TimeoutException(f"No locator strategy matched '{name}' within {timeout}s")
+
+    def wait_gone(self, driver, name, timeout):
+        """Wait until no strategy finds a displayed element for name"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        def gone(d):
+            for strategy in self.ordered(name):
+                for element in d.find_elements(*strategy):
+                    if element.is_displayed():
+                        return False
+            return True
+        WebDriverWait(driver, timeout, poll_frequency=0.1,
+                      ignored_exceptions=[StaleElementReferenceException]).until(gone)
+
+    def dead_strategies(self):
+        dead = []
+        for name, strategies in self.stats.items():
+            # Statistics saved by older versions may cover locators or strategies that no longer exist
+            current = {strategy_key(strategy) for strategy in self.definitions.get(name, [])}
+            for key, stat in strategies.items():
+                if key in current and stat["tries"] >= DEAD_AFTER_TRIES and stat["successes"] == 0:
+                    dead.append((name, key, stat["tries"]))
+        return dead
+
+    def report(self):
+        lines = []
+        for name in self.definitions:
+            for strategy in self.ordered(name):
+                stat = self.stats.get(name, {}).get(strategy_key(strategy))
+                if stat is None or stat["tries"] == 0:
+                    lines.append(f"{name:<20} {'untried':>16}            {strategy_key(strategy)}")
+                    continue
+                mean_ms = stat["total_ms"] / stat["tries"]
+                dead = "  DEAD" if stat["tries"] >= DEAD_AFTER_TRIES and stat["successes"] == 0 else ""
+                lines.append(f"{name:<20} {stat['successes']:>6}/{stat['tries']:<6} ok {mean_ms:>7.1f} ms  {strategy_key(strategy)}{dead}")
+        return "\n".join(lines)
+
+    def save(self):
+        if not self.stats_path:
+            return
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(tmp_path, self.stats_path)
+
+if __name__ == "__main__":
+    # python locators.py [stats.json] -- print the learned order and flag dead strategies
+    registry = LocatorRegistry(sys.argv[1] if len(sys.argv) > 1 else "locator_stats.json")
+    print(registry.report())
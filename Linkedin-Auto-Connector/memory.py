@@ -0,0 +1,115 @@
+from transport import execute_cdp
+
+ACTION_NEW_TAB = "new-tab"
+ACTION_RESTART = "restart"
+
+MB = 1024 * 1024
+
+def browser_rss_mb(driver):
+    """Resident memory of the browser and all its child processes, or None.
+
+    Needs the optional psutil package and a browser on this machine; the browser process is found through the
+    DevTools port chromedriver reports in debuggerAddress.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress", "")
+    host, _, port = address.rpartition(":")
+    if host not in ("localhost", "127.0.0.1", "::1") or not port.isdigit():
+        return None
+    pid = getattr(driver, "browser_pid", None)
+    try:
+        if pid is None:
+            for connection in psutil.net_connections(kind="tcp"):
+                if connection.status == psutil.CONN_LISTEN and connection.laddr.port == int(port) and connection.pid:
+                    pid = connection.pid
+                    break
+            if pid is None:
+                return None
+            driver.browser_pid = pid
+        browser = psutil.Process(pid)
+        processes = [browser] + browser.children(recursive=True)
+        return round(sum(p.memory_info().rss for p in processes) / MB, 1)
+    except psutil.Error:
+        return None
+
+def sample_memory(driver):
+    """JS heap, DOM node and listener counts of the current tab from the DevTools Performance domain, plus RSS"""
+    handle = driver.current_window_handle
+    if getattr(driver, "performance_enabled_for", None) != handle:
+        execute_cdp(driver, "Performance.enable")
+        driver.performance_enabled_for = handle
+    metrics = {m["name"]: m["value"] for m in execute_cdp(driver, "Performance.getMetrics")["metrics"]}
+    return {
+        "heapUsedMb": round(metrics.get("JSHeapUsedSize", 0) / MB, 1),
+        "heapTotalMb": round(metrics.get("JSHeapTotalSize", 0) / MB, 1),
+        "nodes": int(metrics.get("Nodes", 0)),
+        "documents": int(metrics.get("Documents", 0)),
+        "listeners": int(metrics.get("JSEventListeners", 0)),
+        "rssMb": browser_rss_mb(driver),
+    }
+
+class MemoryGovernor:
+    """Samples browser memory every few profiles and decides when to recycle the tab or the whole browser.
+
+    Crossing a tab watermark (heap or DOM nodes) asks for a fresh tab. If the next sample is still over it, or a
+    restart watermark (heap or RSS) is crossed, it asks for a browser restart.
+    """
+
+    def __init__(self, sample_every=25, tab_heap_mb=None, tab_nodes=None, restart_heap_mb=None, restart_rss_mb=None):
+        self.sample_every = sample_every
+        self.tab_heap_mb = tab_heap_mb
+        self.tab_nodes = tab_nodes
+        self.restart_heap_mb = restart_heap_mb
+        self.restart_rss_mb = restart_rss_mb
+        self.profiles = 0
+        self.recycled_tab = False
+        self.samples = []
+
+    def due(self):
+        """Count one processed profile; True when it is time to take a sample"""
+        self.profiles += 1
+        return self.sample_every > 0 and self.profiles % self.sample_every == 0
+
+    def decide(self, sample):
+        if self.restart_rss_mb is not None and sample["rssMb"] is not None and sample["rssMb"] >= self.restart_rss_mb:
+            return ACTION_RESTART
+        if self.restart_heap_mb is not None and sample["heapUsedMb"] >= self.restart_heap_mb:
+            return ACTION_RESTART
+        over_tab = ((self.tab_heap_mb is not None and sample["heapUsedMb"] >= self.tab_heap_mb)
+                    or (self.tab_nodes is not None and sample["nodes"] >= self.tab_nodes))
+        if not over_tab:
+            self.recycled_tab = False
+            return None
+        if self.recycled_tab:
+            # A fresh tab did not bring it back under the watermark
+            return ACTION_RESTART
+        return ACTION_NEW_TAB
+
+    def check(self, driver):
+        """Take a sample and return (sample, action), action being None, ACTION_NEW_TAB or ACTION_RESTART"""
+        sample = sample_memory(driver)
+        sample["profiles"] = self.profiles
+        action = self.decide(sample)
+        sample["action"] = action
+        self.samples.append(sample)
+        if action == ACTION_NEW_TAB:
+            self.recycled_tab = True
+        elif action == ACTION_RESTART:
+            self.recycled_tab = False
+        return sample, action
+
+def memory_governor_from_config(config, section="Memory"):
+    def optional_float(key, default):
+        value = config.get(section, key, fallback=default).strip()
+        return float(value) if value else None
+
+    return MemoryGovernor(
+        sample_every=config.getint(section, "sample_every", fallback=25),
+        tab_heap_mb=optional_float("tab_heap_mb", "512"),
+        tab_nodes=optional_float("tab_nodes", "200000"),
+        restart_heap_mb=optional_float("restart_heap_mb", "1024"),
+        restart_rss_mb=optional_float("restart_rss_mb", ""),
+    )
@@ -0,0 +1,102 @@
+import time
+
+# Stages of sending one invitation that get their own retry policy
+STAGE_LOCATE = "locate"
+STAGE_CLICK = "click"
+STAGE_NOTE = "note"
+STAGE_SEND = "send"
+RETRY_STAGES = (STAGE_LOCATE, STAGE_CLICK, STAGE_NOTE, STAGE_SEND)
+
+# Errors that say nothing about the profile, only that the page moved under us: a re-render replaced the element,
+# an overlay or toast covered it, or it was not laid out yet. Matched by class name so Selenium is not imported.
+STALE = "StaleElementReferenceException"
+INTERCEPTED = "ElementClickInterceptedException"
+NOT_INTERACTABLE = "ElementNotInteractableException"
+OUT_OF_BOUNDS = "MoveTargetOutOfBoundsException"
+TIMEOUT = "TimeoutException"
+
+# A timeout is only transient where a slow modal is the likely cause; a locate that waited its whole ceiling means
+# the element is not there (e.g. no Connect button), which retrying will not change
+DEFAULT_TRANSIENT = {
+    STAGE_LOCATE: {STALE},
+    STAGE_CLICK: {STALE, INTERCEPTED, NOT_INTERACTABLE, OUT_OF_BOUNDS},
+    STAGE_NOTE: {STALE, INTERCEPTED, NOT_INTERACTABLE, TIMEOUT},
+    STAGE_SEND: {STALE, INTERCEPTED, NOT_INTERACTABLE, TIMEOUT},
+}
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BACKOFF_MS = 250
+
+def is_transient(error, transient):
+    return any(cls.__name__ in transient for cls in type(error).__mro__)
+
+class StageFailed(Exception):
+    """A stage kept failing with transient errors until its attempts ran out"""
+
+    def __init__(self, stage, attempts, error):
+        super().__init__(f"{stage} failed after {attempts} attempts: {type(error).__name__}: {error}")
+        self.stage = stage
+        self.attempts = attempts
+        self.error = error
+
+class RetryPolicy:
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, backoff_ms=DEFAULT_BACKOFF_MS, transient=()):
+        self.attempts = max(1, attempts)
+        self.backoff_ms = backoff_ms
+        self.transient = set(transient)
+
+    def delay(self, attempt):
+        """Seconds to wait after the given failed attempt: backoff, doubling each time"""
+        return self.backoff_ms * 2 ** (attempt - 1) / 1000.0
+
+class StageRetries:
+    """Runs each stage under its retry policy and counts, per stage, how often that paid off.
+
+    An action is called as action(attempt) and must locate its element again when attempt > 1, since the element it
+    used before is what went stale or was covered. Errors that are not transient for the stage (including session
+    loss and invitation limits) are raised straight away; transient ones that outlast the attempts raise StageFailed.
+    """
+
+    def __init__(self):
+        self.policies = {stage: RetryPolicy(transient=DEFAULT_TRANSIENT[stage]) for stage in RETRY_STAGES}
+        self.counts = {stage: {"retries": 0, "recovered": 0, "exhausted": 0} for stage in RETRY_STAGES}
+
+    def configure(self, config, section="Retry"):
+        """attempts and backoff_ms apply to every stage; <stage>_attempts overrides one stage"""
+        attempts = config.getint(section, "attempts", fallback=DEFAULT_ATTEMPTS)
+        backoff_ms = config.getint(section, "backoff_ms", fallback=DEFAULT_BACKOFF_MS)
+        for stage in RETRY_STAGES:
+            self.policies[stage] = RetryPolicy(config.getint(section, f"{stage}_attempts", fallback=attempts), backoff_ms,
+                                               DEFAULT_TRANSIENT[stage])
+        return self
+
+    def run(self, stage, action, on_retry=None):
+        policy = self.policies[stage]
+        counts = self.counts[stage]
+        attempt = 1
+        while True:
+            try:
+                result = action(attempt)
+            except Exception as e:
+                if not is_transient(e, policy.transient):
+                    raise
+                if attempt >= policy.attempts:
+                    counts["exhausted"] += 1
+                    raise StageFailed(stage, attempt, e) from e
+                delay = policy.delay(attempt)
+                counts["retries"] += 1
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if attempt > 1:
+                counts["recovered"] += 1
+            return result
+
+    def report(self):
+        lines = []
+        for stage, counts in self.counts.items():
+            if counts["retries"] or counts["exhausted"]:
+                lines.append(f"{stage:<8} retries={counts['retries']:<4} recovered={counts['recovered']:<4} gave up={counts['exhausted']}")
+        return lines
@@ -0,0 +1,200 @@
+import glob
+import json
+import os
+import time
+
+from instrumentation import STAGES, percentile
+
+# How the Connect button was reached for a profile
+PATH_DIRECT = "direct"
+PATH_MORE_MENU = "more-menu"
+PATH_SEARCH_CARD = "search-card"
+
+class RunLog:
+    """Writes one JSONL record per processed profile to runs/run-<timestamp>.jsonl.
+
+    The first line describes the run (flow, job, settings digest); every profile line holds the URL, the path taken
+    to Connect, the outcome, the wall-clock ms spent in each stage and the retries taken. Does nothing until opened.
+    """
+
+    def __init__(self):
+        self.path = None
+        self._file = None
+        self.current = None
+        self.current_stage = None
+        self.stage_started = None
+
+    def open(self, directory, flow, label="", job=None, settings=None, digest=None):
+        self.close()
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        self.path = os.path.join(directory, f"run-{stamp}-{flow}.jsonl")
+        suffix = 1
+        while os.path.exists(self.path):
+            # Two jobs started within the same second
+            suffix += 1
+            self.path = os.path.join(directory, f"run-{stamp}-{flow}-{suffix}.jsonl")
+        self._file = open(self.path, "w")
+        self._write({"type": "run", "ts": time.time(), "flow": flow, "label": label, "job": job,
+                     "settings": settings or {}, "digest": digest})
+        return self
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def begin_profile(self, url):
+        self.end_profile()
+        if self._file is None:
+            return
+        self.current = {"type": "profile", "url": url, "path": None, "outcome": None, "reason": "",
+                        "ts": time.time(), "started": time.perf_counter(), "stage_ms": {}, "retries": {}}
+
+    def set_path(self, path):
+        if self.current is not None:
+            self.current["path"] = path
+
+    def set_stage(self, stage):
+        self._close_stage()
+        if self.current is not None:
+            self.current_stage = stage
+            self.stage_started = time.perf_counter()
+
+    def _close_stage(self):
+        if self.current is not None and self.current_stage is not None:
+            stage_ms = self.current["stage_ms"]
+            elapsed = (time.perf_counter() - self.stage_started) * 1000
+            stage_ms[self.current_stage] = round(stage_ms.get(self.current_stage, 0.0) + elapsed, 1)
+        self.current_stage = None
+        self.stage_started = None
+
+    def retry(self, stage):
+        if self.current is not None:
+            self.current["retries"][stage] = self.current["retries"].get(stage, 0) + 1
+
+    def outcome(self, url, outcome, reason=""):
+        if self.current is not None and self.current["url"] == url:
+            self.current["outcome"] = outcome
+            self.current["reason"] = reason
+
+    def end_profile(self):
+        self._close_stage()
+        if self.current is None:
+            return
+        record = self.current
+        self.current = None
+        record["ms"] = round((time.perf_counter() - record.pop("started")) * 1000, 1)
+        # A profile left without an outcome was cut short (limit reached, browser lost, run interrupted)
+        record["outcome"] = record["outcome"] or "interrupted"
+        self._write(record)
+
+    def close(self):
+        self.end_profile()
+        if self._file is not None:
+            self._write({"type": "end", "ts": time.time()})
+            self._file.close()
+            self._file = None
+
+def load_runs(directory):
+    """Runs in a directory, oldest first, as {"run": header, "profiles": [...], "ended": ts or None}"""
+    runs = []
+    for path in sorted(glob.glob(os.path.join(directory, "run-*.jsonl"))):
+        run = {"path": path, "run": None, "profiles": [], "ended": None}
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a run that was killed mid-write
+                    continue
+                if entry.get("type") == "run":
+                    run["run"] = entry
+                elif entry.get("type") == "profile":
+                    run["profiles"].append(entry)
+                elif entry.get("type") == "end":
+                    run["ended"] = entry["ts"]
+        if run["run"] is not None and run["profiles"]:
+            runs.append(run)
+    runs.sort(key=lambda r: r["run"]["ts"])
+    return runs
+
+def run_hours(run):
+    profiles = run["profiles"]
+    last = profiles[-1]
+    ended = max(run["ended"] or 0, last["ts"] + last["ms"] / 1000.0)
+    return max(ended - run["run"]["ts"], 1.0) / 3600.0
+
+def summarize(runs):
+    """Totals, outcome and path distributions, per-stage latency and per-run trend rows over the given runs"""
+    profiles = [p for run in runs for p in run["profiles"]]
+    hours = sum(run_hours(run) for run in runs)
+    outcomes, paths = {}, {}
+    for profile in profiles:
+        outcomes[profile["outcome"]] = outcomes.get(profile["outcome"], 0) + 1
+        path = profile["path"] or "none"
+        paths[path] = paths.get(path, 0) + 1
+    stages = {}
+    for stage in STAGES + sorted({s for p in profiles for s in p["stage_ms"]} - set(STAGES)):
+        times = [p["stage_ms"][stage] for p in profiles if stage in p["stage_ms"]]
+        if times:
+            stages[stage] = {"profiles": len(times), "p50": round(percentile(times, 50), 1),
+                             "p95": round(percentile(times, 95), 1), "mean": round(sum(times) / len(times), 1)}
+    trend = []
+    previous_digest = None
+    for run in runs:
+        header, run_profiles = run["run"], run["profiles"]
+        entry = {
+            "started": header["ts"],
+            "flow": header["flow"],
+            "label": header.get("job") or header.get("label") or "",
+            "profiles": len(run_profiles),
+            "per_hour": round(len(run_profiles) / run_hours(run), 1),
+            "sent": sum(1 for p in run_profiles if p["outcome"] == "sent"),
+            "profile_ms_p50": round(percentile([p["ms"] for p in run_profiles], 50), 1),
+            "stage_ms_p50": {},
+            "retries": sum(sum(p["retries"].values()) for p in run_profiles),
+            "digest": header.get("digest"),
+            "settings_changed": previous_digest is not None and header.get("digest") != previous_digest,
+        }
+        for stage in stages:
+            times = [p["stage_ms"][stage] for p in run_profiles if stage in p["stage_ms"]]
+            if times:
+                entry["stage_ms_p50"][stage] = round(percentile(times, 50), 1)
+        previous_digest = header.get("digest")
+        trend.append(entry)
+    return {
+        "runs": len(runs),
+        "profiles": len(profiles),
+        "hours": round(hours, 2),
+        "per_hour": round(len(profiles) / hours, 1) if hours else 0.0,
+        "retries": sum(sum(p["retries"].values()) for p in profiles),
+        "outcomes": dict(sorted(outcomes.items(), key=lambda item: -item[1])),
+        "paths": dict(sorted(paths.items(), key=lambda item: -item[1])),
+        "stages": stages,
+        "trend": trend,
+    }
+
+def format_report(summary):
+    """The summary as plain text lines for the terminal"""
+    total = summary["profiles"] or 1
+    lines = [f"{summary['runs']} runs, {summary['profiles']} profiles in {summary['hours']} h "
+             f"({summary['per_hour']} profiles/hour), {summary['retries']} retries", "", "Outcomes:"]
+    for outcome, count in summary["outcomes"].items():
+        lines.append(f"    {outcome:<18} {count:>6}  {100.0 * count / total:5.1f}%")
+    lines += ["", "Path to Connect:"]
+    for path, count in summary["paths"].items():
+        lines.append(f"    {path:<18} {count:>6}  {100.0 * count / total:5.1f}%")
+    lines += ["", "Time per stage (ms):", f"    {'stage':<18} {'profiles':>8} {'p50':>9} {'p95':>9} {'mean':>9}"]
+    for stage, data in summary["stages"].items():
+        lines.append(f"    {stage:<18} {data['profiles']:>8} {data['p50']:>9} {data['p95']:>9} {data['mean']:>9}")
+    stages = list(summary["stages"])
+    lines += ["", "Runs (p50 ms per stage; * = settings changed since the previous run):",
+              "    " + f"{'started':<17} {'flow':<7} {'profiles':>8} {'per hour':>9} {'sent':>5} {'retries':>7} {'profile':>9} "
+              + " ".join(f"{stage[:9]:>9}" for stage in stages) + "  label"]
+    for entry in summary["trend"]:
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["started"]))
+        marker = "*" if entry["settings_changed"] else " "
+        stage_cells = " ".join(f"{entry['stage_ms_p50'].get(stage, ''):>9}" for stage in stages)
+        lines.append(f"  {marker} {started:<17} {entry['flow']:<7} {entry['profiles']:>8} {entry['per_hour']:>9} {entry['sent']:>5} "
+                     f"{entry['retries']:>7} {entry['profile_ms_p50']:>9} {stage_cells}  {entry['label']}")
+    return lines
@@ -0,0 +1,248 @@
+import csv
+import json
+import os
+import time
+
+from ledger import normalize_profile_url
+
+class SourceError(Exception):
+    pass
+
+def column_letter(index):
+    """A1-notation letters for a 1-based column index: 1 -> A, 27 -> AA"""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+class SheetSource:
+    """Reads a single named column of the first worksheet in paged ranges.
+
+    client is an authorized gspread client; by default one is built from the service account in creds_path.
+    """
+
+    def __init__(self, sheet_url, column_name, creds_path, page_size=500, client=None):
+        self.sheet_url = sheet_url
+        self.column_name = column_name
+        self.creds_path = creds_path
+        self.page_size = page_size
+        self.client = client
+        self.worksheet = None
+        self.header = None
+        self.column_index = None
+
+    def open(self):
+        if self.worksheet is None:
+            if self.client is None:
+                import gspread
+                from oauth2client.service_account import ServiceAccountCredentials
+                scope = [
+                    "https://spreadsheets.google.com/feeds",
+                    "https://www.googleapis.com/auth/drive"
+                ]
+                creds = ServiceAccountCredentials.from_json_keyfile_name(self.creds_path, scope)
+                self.client = gspread.authorize(creds)
+            self.worksheet = self.client.open_by_url(self.sheet_url).sheet1
+        if self.column_index is None:
+            self.header = self.worksheet.row_values(1)
+            if self.column_name not in self.header:
+                raise SourceError(f"Column '{self.column_name}' not found in sheet header")
+            self.column_index = self.header.index(self.column_name) + 1
+        return self.worksheet
+
+    def column_letter(self, index=None):
+        return column_letter(index or self.column_index)
+
+    def iter_rows(self):
+        """Yield (row_number, cell_value) for the URL column, one page of rows per request"""
+        worksheet = self.open()
+        letter = self.column_letter()
+        start = 2
+        while start <= worksheet.row_count:
+            end = min(start + self.page_size - 1, worksheet.row_count)
+            values = worksheet.get(f"{letter}{start}:{letter}{end}")
+            for offset, cells in enumerate(values):
+                yield start + offset, cells[0] if cells else ""
+            if len(values) < end - start + 1:
+                # Sheets drops trailing empty rows, so a short page means the rest of the grid is blank
+                break
+            start = end + 1
+
+class CsvSource:
+    def __init__(self, path, column_name):
+        self.path = path
+        self.column_name = column_name
+
+    def iter_rows(self):
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            if self.column_name not in (reader.fieldnames or []):
+                raise SourceError(f"Column '{self.column_name}' not found in {self.path}")
+            for row_number, row in enumerate(reader, start=2):
+                yield row_number, row.get(self.column_name) or ""
+
+class JsonlSource:
+    def __init__(self, path, column_name):
+        self.path = path
+        self.column_name = column_name
+
+    def iter_rows(self):
+        """Yields None for a line that is not a JSON object, so it is counted as invalid rather than ending the run"""
+        with open(self.path, encoding="utf-8") as f:
+            for row_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield row_number, None
+                    continue
+                if not isinstance(record, dict):
+                    yield row_number, None
+                    continue
+                value = record.get(self.column_name)
+                yield row_number, str(value) if value is not None else ""
+
+class XlsxSource:
+    def __init__(self, path, column_name):
+        self.path = path
+        self.column_name = column_name
+
+    def iter_rows(self):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise SourceError("Reading .xlsx files requires openpyxl (pip install openpyxl)")
+        workbook = load_workbook(self.path, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell) if cell is not None else "" for cell in next(rows, ())]
+            if self.column_name not in header:
+                raise SourceError(f"Column '{self.column_name}' not found in {self.path}")
+            index = header.index(self.column_name)
+            for row_number, row in enumerate(rows, start=2):
+                value = row[index] if index < len(row) else None
+                yield row_number, str(value) if value is not None else ""
+        finally:
+            workbook.close()
+
+# Written to the three columns right of the URL column
+STATUS_HEADERS = ["Connector Status", "Connector Updated", "Connector Reason"]
+
+class SheetStatusWriter:
+    """Buffers a status, timestamp and reason per sheet row and writes them next to the URL column.
+
+    Each flush is a single batch_update covering every buffered row, so API calls grow with the number of
+    flushes, not with the number of cells.
+    """
+
+    def __init__(self, source, flush_every=25):
+        self.source = source
+        self.flush_every = flush_every
+        self.pending = {}
+        self.flushes = 0
+        self.first_column = None
+
+    def open(self):
+        """Claim the status columns. They must be blank or already carry our headers; nothing else is overwritten"""
+        worksheet = self.source.open()
+        self.first_column = self.source.column_index + 1
+        last_column = self.first_column + len(STATUS_HEADERS) - 1
+        header = list(self.source.header) + [""] * len(STATUS_HEADERS)
+        existing = header[self.first_column - 1:last_column]
+        for offset, (cell, expected) in enumerate(zip(existing, STATUS_HEADERS)):
+            if cell and cell != expected:
+                raise SourceError(f"Column {column_letter(self.first_column + offset)} ('{cell}') is in the way of the status "
+                                  f"columns; insert {len(STATUS_HEADERS)} blank columns after '{self.source.column_name}'")
+        if worksheet.col_count < last_column:
+            worksheet.add_cols(last_column - worksheet.col_count)
+        if existing != STATUS_HEADERS:
+            # Written straight away so a sheet the service account cannot edit fails before the run starts
+            self.pending[1] = list(STATUS_HEADERS)
+            self.flush()
+        return self
+
+    def record(self, row, status, reason=""):
+        self.pending[row] = [status, time.strftime("%Y-%m-%d %H:%M:%S"), reason]
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def ranges(self):
+        """Buffered rows as [{"range": "C5:E7", "values": [...]}, ...], one entry per run of consecutive rows"""
+        first, last = column_letter(self.first_column), column_letter(self.first_column + len(STATUS_HEADERS) - 1)
+        data = []
+        for row in sorted(self.pending):
+            if data and data[-1]["end"] == row - 1:
+                data[-1]["end"] = row
+                data[-1]["values"].append(self.pending[row])
+            else:
+                data.append({"start": row, "end": row, "values": [self.pending[row]]})
+        return [{"range": f"{first}{d['start']}:{last}{d['end']}", "values": d["values"]} for d in data]
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.source.worksheet.batch_update(self.ranges(), value_input_option="RAW")
+        self.pending.clear()
+        self.flushes += 1
+
+    def close(self):
+        self.flush()
+
+LOCAL_SOURCES = {
+    ".csv": CsvSource,
+    ".jsonl": JsonlSource,
+    ".xlsx": XlsxSource,
+}
+
+def open_source(location, column_name, creds_path=None, page_size=500):
+    """Pick a source for a Google Sheet URL or a local .csv/.jsonl/.xlsx file"""
+    if location.startswith("http://") or location.startswith("https://"):
+        return SheetSource(location, column_name, creds_path, page_size)
+    extension = os.path.splitext(location)[1].lower()
+    if extension not in LOCAL_SOURCES:
+        raise SourceError(f"Unsupported profile list '{location}', expected a Google Sheet URL or {', '.join(LOCAL_SOURCES)} file")
+    return LOCAL_SOURCES[extension](location, column_name)
+
+def iter_profile_rows(source, limit=None, skip=None, stats=None, start_row=0):
+    """Lazily yield (row_number, normalized_url) for valid, unique profile URLs.
+
+    Rows up to and including start_row, and rows for which skip(url) is true, do not count towards limit.
+    Reading stops as soon as limit is met.
+    """
+    stats = stats if stats is not None else {}
+    for key in ("rows", "invalid", "duplicates", "skipped", "yielded"):
+        stats.setdefault(key, 0)
+    seen = set()
+    if limit is not None and limit <= 0:
+        return
+    for row_number, value in source.iter_rows():
+        if row_number <= start_row:
+            continue
+        stats["rows"] += 1
+        if value is None:
+            stats["invalid"] += 1
+            continue
+        if not value.strip():
+            continue
+        url = normalize_profile_url(value)
+        if url is None:
+            stats["invalid"] += 1
+            continue
+        if url in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(url)
+        if skip is not None and skip(url):
+            stats["skipped"] += 1
+            continue
+        stats["yielded"] += 1
+        yield row_number, url
+        if limit is not None and stats["yielded"] >= limit:
+            return
+
+def iter_profile_urls(source, limit=None, skip=None, stats=None, start_row=0):
+    for _, url in iter_profile_rows(source, limit, skip, stats, start_row):
+        yield url
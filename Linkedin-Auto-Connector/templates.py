@@ -0,0 +1,73 @@
+from string import Formatter
+
+# LinkedIn's limit for invitation notes; free accounts may get less, set [Notes] max_length accordingly
+DEFAULT_MAX_LENGTH = 300
+
+# Fields a note may use, all derived from the name already read from the profile header or search card
+FIELDS = ("name", "firstName", "lastName", "fullName")
+
+class TemplateError(ValueError):
+    pass
+
+def note_length(text):
+    """Length as the note textarea counts it (UTF-16 code units, so most emoji count as 2)"""
+    return len(text.encode("utf-16-le")) // 2
+
+def note_fields(full_name):
+    """Field values for a profile, from its full name alone"""
+    parts = (full_name or "").split()
+    first = parts[0].title() if parts else "there"
+    return {
+        "name": first,
+        "firstName": first,
+        "lastName": parts[-1].title() if len(parts) > 1 else "",
+        "fullName": " ".join(parts) or "there",
+    }
+
+class NoteTemplate:
+    """A note parsed once into literal text and field slots, e.g. "Hi {name}, ..." """
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError as e:
+            raise TemplateError(f"Malformed note template {text!r}: {e}")
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                if field not in FIELDS:
+                    raise TemplateError(f"Unknown field {{{field}}} in note template; use {', '.join('{' + f + '}' for f in FIELDS)}")
+                if spec or conversion:
+                    raise TemplateError(f"Formatting is not supported in note fields: {{{field}}}")
+            self.parts.append((literal, field))
+        self.fields = {field for _, field in self.parts if field}
+
+    def render(self, values):
+        return "".join(literal + (values[field] if field else "") for literal, field in self.parts)
+
+class NotePlan:
+    """The note template plus fallbacks, tried in order until one renders within max_length"""
+
+    def __init__(self, templates, max_length=DEFAULT_MAX_LENGTH):
+        self.templates = [t if isinstance(t, NoteTemplate) else NoteTemplate(t) for t in templates if t]
+        self.max_length = max_length
+        self.fallbacks_used = 0
+        self.too_long = 0
+
+    def render(self, full_name):
+        """The first template that fits for this profile, or None if none does"""
+        values = note_fields(full_name)
+        for index, template in enumerate(self.templates):
+            note = template.render(values)
+            if note_length(note) <= self.max_length:
+                self.fallbacks_used += index > 0
+                return note
+        self.too_long += 1
+        return None
+
+def compile_notes(letter, fallbacks=(), max_length=DEFAULT_MAX_LENGTH):
+    """NotePlan for letter (a template string or an existing plan); raises TemplateError for a bad template"""
+    if isinstance(letter, NotePlan):
+        return letter
+    return NotePlan([letter] + list(fallbacks), max_length)
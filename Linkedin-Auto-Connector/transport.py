@@ -0,0 +1,155 @@
+import json
+import time
+
+def pooled_executor(url, keep_alive=True, pool_maxsize=4, connect_timeout=5.0, read_timeout=120.0):
+    """RemoteConnection for url whose urllib3 pool reuses connections and applies separate connect/read timeouts"""
+    import urllib3
+    from selenium.webdriver.remote.client_config import ClientConfig
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+    client_config = ClientConfig(
+        url,
+        keep_alive=keep_alive,
+        # Selenium passes this timeout with every request, so the connect/read split has to be set here
+        timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+        # RemoteConnection reads the pool arguments from this nested key and passes them on to urllib3's PoolManager
+        init_args_for_pool_manager={"init_args_for_pool_manager": {
+            "maxsize": pool_maxsize,
+            "block": False,
+            # A failed command is surfaced to the caller instead of being silently re-sent
+            "retries": False,
+        }},
+    )
+    return RemoteConnection(client_config=client_config)
+
+def execute_cdp(driver, cmd, params=None):
+    """Run a DevTools protocol command; works for local Chrome and for a remote chromedriver session"""
+    executor = driver.command_executor
+    if "executeCdpCommand" not in executor._commands:
+        executor._commands["executeCdpCommand"] = ("POST", "/session/$sessionId/goog/cdp/execute")
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+
+class DevToolsError(Exception):
+    pass
+
+class DevToolsDisconnected(DevToolsError):
+    pass
+
+def script_expression(script, args, is_async=False):
+    """Wrap a WebDriver-style script body (uses `arguments`, may `return`) as a Runtime.evaluate expression"""
+    body = "function () {\n" + script + "\n}"
+    args_json = json.dumps(list(args))
+    if is_async:
+        # execute_async_script passes its callback as the last argument
+        return f"new Promise(function (resolve) {{ ({body}).apply(null, {args_json}.concat([resolve])); }})"
+    return f"({body}).apply(null, {args_json})"
+
+class DevToolsTransport:
+    """Evaluates scripts in the driver's tab over one DevTools websocket instead of a WebDriver HTTP call each.
+
+    Several evaluations can be pipelined with evaluate_many: all are written to the socket before any reply is
+    read. Only scripts that return plain JSON values can use this; element handles still need WebDriver.
+    Needs the optional websocket-client package.
+    """
+
+    def __init__(self, ws_url, timeout=120.0, driver=None):
+        try:
+            import websocket
+        except ImportError:
+            raise DevToolsError("The DevTools transport requires websocket-client (pip install websocket-client)")
+        self._websocket = websocket
+        self.driver = driver
+        self.session_id = None
+        self._next_id = 0
+        try:
+            # Chrome rejects websocket clients that send an Origin header unless --remote-allow-origins is set
+            self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        except (OSError, websocket.WebSocketException) as e:
+            raise DevToolsDisconnected(f"Could not open {ws_url}: {e}")
+
+    @classmethod
+    def connect(cls, driver, timeout=120.0):
+        """Attach to the tab the driver controls, via chromedriver's debuggerAddress or a Grid's se:cdp endpoint"""
+        import urllib.request
+
+        capabilities = driver.capabilities
+        target_id = driver.current_window_handle
+        address = capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if address:
+            try:
+                with urllib.request.urlopen(f"http://{address}/json/list", timeout=10) as response:
+                    targets = json.load(response)
+            except OSError as e:
+                raise DevToolsDisconnected(f"Could not list DevTools targets at {address}: {e}")
+            pages = [t for t in targets if t.get("type") == "page"]
+            page = next((t for t in pages if t.get("id") == target_id), pages[0] if pages else None)
+            if page is None:
+                raise DevToolsError(f"No page target at {address}")
+            return cls(page["webSocketDebuggerUrl"], timeout, driver)
+        if capabilities.get("se:cdp"):
+            transport = cls(capabilities["se:cdp"], timeout, driver)
+            transport.session_id = transport.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+            return transport
+        raise DevToolsError("The WebDriver session exposes no DevTools endpoint")
+
+    def send_many(self, calls):
+        """Send [(method, params), ...] back to back, then collect the replies in order"""
+        started = time.perf_counter()
+        ids = []
+        try:
+            for method, params in calls:
+                self._next_id += 1
+                message = {"id": self._next_id, "method": method, "params": params or {}}
+                if self.session_id:
+                    message["sessionId"] = self.session_id
+                self.ws.send(json.dumps(message))
+                ids.append(self._next_id)
+            replies = {}
+            while len(replies) < len(ids):
+                message = json.loads(self.ws.recv())
+                if message.get("id") in ids:
+                    replies[message["id"]] = message
+        except (OSError, self._websocket.WebSocketException) as e:
+            raise DevToolsDisconnected(str(e))
+        self._record(calls, (time.perf_counter() - started) * 1000)
+        results = []
+        for (method, _), message_id in zip(calls, ids):
+            reply = replies[message_id]
+            if "error" in reply:
+                raise DevToolsError(f"{method}: {reply['error'].get('message')}")
+            results.append(reply.get("result", {}))
+        return results
+
+    def send(self, method, params=None):
+        return self.send_many([(method, params)])[0]
+
+    def evaluate_many(self, scripts):
+        """Run [(script, args, is_async), ...] in one pipelined batch and return their values"""
+        calls = [("Runtime.evaluate", {
+            "expression": script_expression(script, args, is_async),
+            "returnByValue": True,
+            "awaitPromise": True,
+        }) for script, args, is_async in scripts]
+        values = []
+        for result in self.send_many(calls):
+            if "exceptionDetails" in result:
+                details = result["exceptionDetails"]
+                raise DevToolsError(details.get("exception", {}).get("description") or details.get("text"))
+            values.append(result.get("result", {}).get("value"))
+        return values
+
+    def evaluate(self, script, args=(), is_async=False):
+        return self.evaluate_many([(script, args, is_async)])[0]
+
+    def _record(self, calls, elapsed_ms):
+        # Show up in the WebDriver command trace like any other command
+        tracer = getattr(self.driver, "command_tracer", None)
+        if tracer is not None:
+            for method, _ in calls:
+                tracer.record("devtools:" + method, elapsed_ms / len(calls))
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
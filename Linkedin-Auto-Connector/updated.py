@@ -1,106 +1,686 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium, requests and the Google client libraries are imported inside the functions that use them, and nothing
+# is read from disk until main() calls load_config(), so importing this module stays cheap and side-effect free
+from __future__ import annotations
 from configparser import ConfigParser
-from selenium.webdriver.common.action_chains import ActionChains
-from colorama import Fore, Style, init
-import time, requests
-from urllib.parse import quote
+from colorama import Fore, init
+import os, time, json
+from urllib.parse import quote, urlencode
 
-# Google Sheets imports
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from ledger import OutcomeLedger, retry_policy_from_config, OUTCOMES, OUTCOME_SENT, OUTCOME_FOLLOW_ONLY, OUTCOME_NOT_CONFIRMED, OUTCOME_FAILED
+from sources import SheetSource, SheetStatusWriter, open_source, iter_profile_urls, iter_profile_rows
+from instrumentation import CommandTracer, mark_stage, begin_profile, end_profile, record_event
+from checkpoint import ProgressJournal
+from locators import LocatorRegistry
+from geo_cache import GeoUrnCache, geo_urn_from_url
+from transport import pooled_executor, execute_cdp, DevToolsTransport, DevToolsError, DevToolsDisconnected
+from memory import memory_governor_from_config, ACTION_NEW_TAB, ACTION_RESTART
+from templates import compile_notes, TemplateError, DEFAULT_MAX_LENGTH
+from jobs import load_jobs, write_job_reports, JobError, FLOW_LIST
+from runlog import RunLog, load_runs, summarize, format_report, PATH_DIRECT, PATH_MORE_MENU, PATH_SEARCH_CARD
+from retries import StageRetries, StageFailed, STAGE_LOCATE, STAGE_CLICK, STAGE_NOTE, STAGE_SEND
+from budget import (InvitationLimitReached, budget_from_config, LIMIT_WEEKLY, LIMIT_RESTRICTED, LIMIT_NOTES_EXHAUSTED,
+                    SENT_WITH_NOTE, SENT_WITHOUT_NOTE)
 
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+# Only for the type annotations; typing.TYPE_CHECKING would cost the typing import
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from selenium import webdriver
 
-# Initialize colorama
-init(autoreset=True)
-
-# Initialize config parser
+# Initialize config parser; filled in by load_config()
 config = ConfigParser()
 config_file = 'setup.ini'
-config.read(config_file)
 
 remote_webdriver_url = "http://localhost:52613"
 
+locators = LocatorRegistry()
+stage_retries = StageRetries()
+run_log = RunLog()
+
+def load_config(path=None):
+    """Read setup.ini (or path) and point the locator registry at its saved statistics"""
+    global config_file
+    if path:
+        config_file = path
+    config.read(config_file)
+    locators.load(config.get('Locators', 'stats_path', fallback='locator_stats.json'))
+    stage_retries.configure(config)
+    return config
+
+# Cheap authenticated page used to check li_at without a browser, and a tiny same-origin page to set the cookie on
+SESSION_PROBE_URL = "https://www.linkedin.com/feed/"
+COOKIE_ORIGIN_URL = "https://www.linkedin.com/robots.txt"
+
+# Requests dropped in lean mode; override with a comma-separated `block_patterns` in the [Browser] section
+LEAN_BLOCK_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*media.licdn.com/dms/image*", "*static.licdn.com/aero-v1/sc/h/*.woff*",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*", "*px.ads.linkedin.com*",
+    "*bat.bing.com*", "*facebook.net*",
+]
+
+# Bytes transferred and timing for the current document, from the Resource/Navigation Timing APIs.
+# Cross-origin resources without Timing-Allow-Origin report 0 bytes, so this is a lower bound.
+NAVIGATION_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const r of resources) bytes += r.transferSize || 0;
+return {
+    bytes: bytes,
+    resources: resources.length,
+    domContentLoadedMs: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+    loadMs: nav && nav.loadEventEnd ? Math.round(nav.loadEventEnd) : null,
+};
+"""
+
+# Ceilings (seconds) for each readiness wait; override any of them in the [Timeouts] section of setup.ini
+STEP_TIMEOUTS = {
+    "login": 10,
+    "page_load": 15,
+    "menu": 5,
+    "click": 5,
+    "modal": 5,
+    "modal_close": 5,
+    "confirm": 3,
+    "results": 10,
+    "next_page": 10,
+    "filter": 10,
+}
+
+# Resolves once the DOM has had no mutations for quietMs, or when ceilingMs runs out
+DOM_IDLE_SCRIPT = """
+const quietMs = arguments[0], ceilingMs = arguments[1], done = arguments[arguments.length - 1];
+const start = Date.now();
+let last = start;
+const observer = new MutationObserver(() => { last = Date.now(); });
+observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+(function check() {
+    const now = Date.now();
+    if (now - last >= quietMs || now - start >= ceilingMs) {
+        observer.disconnect();
+        done(now - start);
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
 def setup_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     chrome_options = Options()
     chrome_options.add_argument("--log-level=2")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
-    driver = webdriver.Remote(options=chrome_options, command_executor=remote_webdriver_url)
+    user_data_dir = config.get('Session', 'user_data_dir', fallback='')
+    if user_data_dir:
+        # Persistent profile: cookies and cache survive between runs
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    if config.getboolean('Browser', 'headless', fallback=False):
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1366,900")
+    if lean_mode():
+        # Return from get() at DOMContentLoaded ("eager") or immediately ("none"); the readiness waits take over
+        chrome_options.page_load_strategy = config.get('Browser', 'page_load_strategy', fallback='eager')
+    driver = None
+    for url in executor_urls():
+        try:
+            driver = webdriver.Remote(options=chrome_options, command_executor=make_executor(url))
+            break
+        except Exception as e:
+            last_error = e
+            print(Fore.YELLOW + f"[INFO] WebDriver executor {url} unavailable: {e}")
+    if driver is None:
+        raise last_error
+    driver.set_script_timeout(max(step_timeout(step) for step in STEP_TIMEOUTS) + 5)
+    driver.devtools = None
+    prepare_tab(driver)
     return driver
 
+def prepare_tab(driver):
+    """Per-tab setup: request blocking in lean mode and the DevTools script transport"""
+    if lean_mode():
+        patterns = config.get('Browser', 'block_patterns', fallback='')
+        patterns = [p.strip() for p in patterns.split(',') if p.strip()] or LEAN_BLOCK_PATTERNS
+        execute_cdp(driver, "Network.enable")
+        execute_cdp(driver, "Network.setBlockedURLs", {"urls": patterns})
+    if getattr(driver, "devtools", None) is not None:
+        driver.devtools.close()
+        driver.devtools = None
+    if config.getboolean('Executor', 'devtools', fallback=False):
+        try:
+            driver.devtools = DevToolsTransport.connect(driver, timeout=config.getfloat('Executor', 'read_timeout', fallback=120))
+            print(Fore.CYAN + "[INFO] Page scripts run over the DevTools websocket")
+        except DevToolsError as e:
+            print(Fore.YELLOW + f"[INFO] DevTools transport unavailable, using WebDriver for scripts: {e}")
+
+def open_fresh_tab(driver):
+    """Replace the current tab with a new one. Cookies and the browser profile are kept; the old tab's heap and
+    DOM are released"""
+    old_handle = driver.current_window_handle
+    driver.switch_to.new_window('tab')
+    new_handle = driver.current_window_handle
+    driver.switch_to.window(old_handle)
+    driver.close()
+    driver.switch_to.window(new_handle)
+    prepare_tab(driver)
+
+# --- WebDriver executor ---
+def executor_urls():
+    """Executor endpoints to try in order; the first that starts a session is used"""
+    urls = config.get('Executor', 'urls', fallback=remote_webdriver_url)
+    return [url.strip() for url in urls.split(',') if url.strip()] or [remote_webdriver_url]
+
+def make_executor(url):
+    return pooled_executor(
+        url,
+        keep_alive=config.getboolean('Executor', 'keep_alive', fallback=True),
+        pool_maxsize=config.getint('Executor', 'pool_maxsize', fallback=4),
+        connect_timeout=config.getfloat('Executor', 'connect_timeout', fallback=5),
+        read_timeout=config.getfloat('Executor', 'read_timeout', fallback=120),
+    )
+
+def run_script(driver, script, *args, is_async=False):
+    """execute_script / execute_async_script for scripts that return plain values.
+
+    Goes over the DevTools websocket when one is attached; if that connection drops, the transport is dropped and
+    the script runs through WebDriver instead.
+    """
+    transport = getattr(driver, "devtools", None)
+    if transport is not None:
+        try:
+            return transport.evaluate(script, args, is_async)
+        except DevToolsDisconnected as e:
+            drop_devtools(driver, e)
+    if is_async:
+        return driver.execute_async_script(script, *args)
+    return driver.execute_script(script, *args)
+
+def run_scripts(driver, scripts):
+    """Run [(script, args, is_async), ...] in order and return their values, like run_script for each.
+
+    Over DevTools they are pipelined as one batch, so the round trips overlap; through WebDriver each is its own call.
+    """
+    transport = getattr(driver, "devtools", None)
+    if transport is not None:
+        try:
+            return transport.evaluate_many(scripts)
+        except DevToolsDisconnected as e:
+            drop_devtools(driver, e)
+    return [run_script(driver, script, *args, is_async=is_async) for script, args, is_async in scripts]
+
+def drop_devtools(driver, error):
+    print(Fore.YELLOW + f"[INFO] DevTools connection lost, falling back to WebDriver: {error}")
+    driver.devtools.close()
+    driver.devtools = None
+
+def quit_driver(driver):
+    transport = getattr(driver, "devtools", None)
+    if transport is not None:
+        transport.close()
+    driver.quit()
+
+def lean_mode():
+    return config.getboolean('Browser', 'lean', fallback=False)
+
+def navigation_metrics(driver):
+    return run_script(driver, NAVIGATION_METRICS_SCRIPT)
+
+def open_page(driver, url):
+    """Navigate and wait until the page is usable; in lean mode also report load time and bytes transferred"""
+    started = time.perf_counter()
+    driver.get(url)
+    wait_for_page_ready(driver)
+    if lean_mode():
+        metrics = navigation_metrics(driver)
+        metrics["url"] = url
+        metrics["wallMs"] = round((time.perf_counter() - started) * 1000)
+        record_event(driver, "navigation", metrics)
+        print(Fore.CYAN + f"[INFO] Loaded in {metrics['wallMs']} ms, {metrics['bytes'] / 1024:.0f} KB over {metrics['resources']} resources")
+
+# --- Readiness waits ---
+def step_timeout(step):
+    return config.getfloat('Timeouts', step, fallback=STEP_TIMEOUTS[step])
+
+def wait_for(driver, step, condition):
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, step_timeout(step), poll_frequency=0.1).until(condition)
+
+def wait_for_page_ready(driver, step="page_load"):
+    # With an eager/none load strategy only the DOM is needed; subresources are not waited for
+    ready_states = ("interactive", "complete") if lean_mode() else ("complete",)
+    wait_for(driver, step, lambda d: run_script(d, "return document.readyState") in ready_states)
+
+def wait_for_dom_idle(driver, step, quiet_ms=300):
+    """Block until the page stops mutating, capped by the step's ceiling"""
+    return run_script(driver, DOM_IDLE_SCRIPT, quiet_ms, int(step_timeout(step) * 1000), is_async=True)
+
+def locate(driver, name, step, state="clickable"):
+    """Find a registry element, trying its strategies in learned order within the step's ceiling"""
+    return locators.find(driver, name, step_timeout(step), state)
+
+def wait_for_modal(driver):
+    return locate(driver, "dialog", "modal", "present")
+
+def wait_for_modal_closed(driver):
+    locators.wait_gone(driver, "dialog", step_timeout("modal_close"))
+
+def scroll_into_view(driver, element):
+    # Single round trip; the offset keeps the element clear of the sticky header
+    driver.execute_script("arguments[0].scrollIntoView(true); window.scrollBy(0, -150);", element)
+
+def click_next_page(driver):
+    """Click the pagination 'Next' button and wait for the new results page to render"""
+    from selenium.webdriver.support import expected_conditions as EC
+    current_url = driver.current_url
+    # A single check: a missing Next button means this is the last page
+    locators.find(driver, "next_page", 0, "clickable").click()
+    wait_for(driver, "next_page", EC.url_changes(current_url))
+    wait_for_dom_idle(driver, "results")
+
+def save_config():
+    with open(config_file, 'w') as f:
+        config.write(f)
+
 def save_cookie(driver:webdriver.Chrome):
     li_at_cookie = driver.get_cookie('li_at')['value']
     config.set('LinkedIn', 'li_at', li_at_cookie)
-    with open(config_file, 'w') as f:
-        config.write(f)
+    save_config()
 
-def login_with_cookie(driver:webdriver.Chrome, li_at):
-    print(Fore.YELLOW + "Attempting to log in with cookie...")
-    driver.get("https://www.linkedin.com")
+# Chrome drops cookies without an expiry when it restarts, which would leave a persistent profile logged out
+COOKIE_LIFETIME_DAYS = 365
+
+def add_li_at_cookie(driver, li_at):
     driver.add_cookie({
         "name": "li_at",
         "value": f"{li_at}",
         "path": "/",
         "secure": True,
+        "expiry": int(time.time()) + COOKIE_LIFETIME_DAYS * 86400,
     })
+
+def profile_has_cookie(driver, li_at):
+    """True if the browser profile holds this li_at for linkedin.com; read over DevTools, so no page is loaded"""
+    try:
+        cookies = execute_cdp(driver, "Network.getCookies", {"urls": ["https://www.linkedin.com/"]})["cookies"]
+    except Exception as e:
+        if is_session_lost(e):
+            raise
+        return False
+    return any(cookie["name"] == "li_at" and cookie["value"] == li_at for cookie in cookies)
+
+def login_with_cookie(driver:webdriver.Chrome, li_at):
+    print(Fore.YELLOW + "Attempting to log in with cookie...")
+    mark_stage(driver, "login")
+    driver.get("https://www.linkedin.com")
+    add_li_at_cookie(driver, li_at)
     driver.refresh()
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "global-nav-typeahead")))
+    locate(driver, "global_nav", "login", "present")
     print(Fore.GREEN + "[INFO] Logged in with cookie successfully.")
 
+def probe_session(li_at):
+    """Check li_at with one HTTP request. Returns True/False, or None if LinkedIn gave no clear answer"""
+    import requests
+    try:
+        response = requests.get(SESSION_PROBE_URL, cookies={"li_at": li_at}, allow_redirects=False,
+                                timeout=config.getfloat('Session', 'probe_timeout', fallback=5), stream=True)
+        response.close()
+    except requests.RequestException as e:
+        print(Fore.YELLOW + f"[INFO] Session probe failed: {e}")
+        return None
+    if response.status_code == 200:
+        return True
+    if response.status_code in (301, 302, 303, 307, 401, 403):
+        return False
+    return None
+
+def session_recently_verified(li_at):
+    if not li_at or li_at != config.get('LinkedIn', 'li_at', fallback=''):
+        return False
+    verified_at = config.getfloat('LinkedIn', 'li_at_verified_at', fallback=0)
+    return time.time() - verified_at < config.getfloat('Session', 'cache_minutes', fallback=60) * 60
+
+def profile_cookie_key(li_at):
+    """Identifies a cookie in a browser profile directory, so a new cookie or another profile is never taken as logged in"""
+    import hashlib
+    user_data_dir = os.path.abspath(config.get('Session', 'user_data_dir', fallback=''))
+    return hashlib.sha256(f"{user_data_dir}\n{li_at}".encode()).hexdigest()[:16]
+
+def mark_session_verified(li_at, in_profile=False):
+    if not config.has_section('LinkedIn'):
+        config.add_section('LinkedIn')
+    config.set('LinkedIn', 'li_at', li_at)
+    config.set('LinkedIn', 'li_at_verified_at', f"{time.time():.0f}")
+    config.set('LinkedIn', 'li_at_in_profile', profile_cookie_key(li_at) if in_profile else '')
+    save_config()
+
+def login(driver:webdriver.Chrome, li_at):
+    """Log in with the fewest page loads possible. Returns 'warm', 'cookie' or 'credentials'"""
+    mark_stage(driver, "login")
+    persistent = bool(config.get('Session', 'user_data_dir', fallback=''))
+    if session_recently_verified(li_at):
+        valid = True
+    else:
+        valid = probe_session(li_at)
+    if valid:
+        if persistent and config.get('LinkedIn', 'li_at_in_profile', fallback='') == profile_cookie_key(li_at):
+            # This profile directory should already carry this very cookie; confirm it did survive the restart,
+            # then go straight to the first target page
+            if profile_has_cookie(driver, li_at):
+                mark_session_verified(li_at, in_profile=True)
+                print(Fore.GREEN + "[INFO] Reusing the logged-in browser profile.")
+                return "warm"
+            print(Fore.YELLOW + "[INFO] The browser profile lost its li_at cookie, setting it again.")
+        driver.get(COOKIE_ORIGIN_URL)
+        add_li_at_cookie(driver, li_at)
+        mark_session_verified(li_at, in_profile=persistent)
+        print(Fore.GREEN + "[INFO] Logged in with cookie successfully.")
+        return "cookie"
+    try:
+        if valid is False:
+            raise ValueError("li_at cookie was rejected by the session probe")
+        login_with_cookie(driver, li_at)
+        mark_session_verified(li_at, in_profile=persistent)
+        return "cookie"
+    except Exception as e:
+        print(Fore.RED + f"[INFO] Cookie login failed: {e}\n" + Fore.YELLOW + "Attempting login with credentials.")
+        email = config.get('LinkedIn', 'email')
+        password = config.get('LinkedIn', 'password')
+        login_with_credentials(driver, email, password)
+        mark_session_verified(config.get('LinkedIn', 'li_at'), in_profile=persistent)
+        return "credentials"
+
+def start_session(li_at, tracer=None):
+    """Start the browser, attach the tracer and log in, reporting how long startup took"""
+    started = time.perf_counter()
+    driver = setup_driver()
+    if tracer is None:
+        tracer = start_trace(driver)
+    else:
+        tracer.attach(driver)
+    driver.run_log = run_log
+    mode = login(driver, li_at)
+    print(Fore.CYAN + f"[INFO] Startup ({mode}) took {time.perf_counter() - started:.1f}s")
+    return driver, tracer
+
+# Messages chromedriver uses when the browser or the session behind it has gone away
+SESSION_LOST_MESSAGES = ("invalid session id", "session deleted", "chrome not reachable", "disconnected", "no such window", "target window already closed")
+
+def is_session_lost(error):
+    """True for errors that mean the WebDriver session is unusable, as opposed to a problem with the page"""
+    from selenium.common.exceptions import WebDriverException, InvalidSessionIdException, NoSuchWindowException
+    from urllib3.exceptions import HTTPError as Urllib3HTTPError
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, Urllib3HTTPError, ConnectionError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or "").lower()
+        return any(text in message for text in SESSION_LOST_MESSAGES)
+    return False
+
+class BrowserSession:
+    """Owns the driver for a run so a flow can replace it after the remote session dies"""
+
+    def __init__(self, li_at):
+        self.li_at = li_at
+        self.driver = None
+        self.tracer = None
+        self.restarts = 0
+
+    def start(self):
+        self.driver, self.tracer = start_session(self.li_at, self.tracer)
+        return self.driver
+
+    def restart(self, planned=False):
+        """Throw away the current browser, start a new one and log in again.
+
+        Planned restarts (memory recycling) do not count towards max_restarts.
+        """
+        max_restarts = config.getint('Session', 'max_restarts', fallback=3)
+        if not planned and self.restarts >= max_restarts:
+            raise RuntimeError(f"Browser session lost again after {max_restarts} restarts, giving up")
+        if self.tracer is not None:
+            self.tracer.detach()
+        try:
+            quit_driver(self.driver)
+        except Exception:
+            pass
+        if not planned:
+            self.restarts += 1
+        # Use the freshest cookie; a credentials login may have replaced it
+        self.li_at = config.get('LinkedIn', 'li_at', fallback=self.li_at)
+        return self.start()
+
+    def close(self):
+        finish_trace(self.tracer)
+        save_locator_stats()
+        report_retries()
+        quit_driver(self.driver)
+
+# Network facet values for each connection degree
+NETWORK_CODES = {"1st": "F", "2nd": "S", "3rd": "O"}
+
+def build_search_url(keyword, connection_degree="", geo_urn=None, base_url="https://www.linkedin.com"):
+    params = {"keywords": keyword.lower()}
+    network = NETWORK_CODES.get(connection_degree.lower())
+    if network:
+        params["network"] = json.dumps([network])
+    if geo_urn:
+        params["geoUrn"] = json.dumps([geo_urn])
+    params["origin"] = "FACETED_SEARCH"
+    return f"{base_url}/search/results/people/?{urlencode(params, quote_via=quote)}"
+
+# Typeahead suggestion matching the typed location: an exact case-insensitive match if there is one, else the first
+# suggestion that starts with it
+LOCATION_OPTION_SCRIPT = """
+var wanted = arguments[0].trim().toLowerCase().replace(/\\s+/g, ' ');
+var options = Array.from(document.querySelectorAll("[role='listbox'] [role='option']")).filter(function (o) {
+    return o.offsetParent !== null;
+});
+var texts = options.map(function (o) { return o.innerText.trim().toLowerCase().replace(/\\s+/g, ' '); });
+var index = texts.indexOf(wanted);
+if (index < 0) index = texts.findIndex(function (t) { return t.indexOf(wanted) === 0; });
+return index < 0 ? null : options[index];
+"""
+
 def select_location(driver:webdriver.Chrome, location:str):
+    """Apply the location filter through the UI and return the geoUrn it resolved to, or None"""
+    from selenium.webdriver.support import expected_conditions as EC
     try:
         print("Selecting location")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "searchFilter_geoUrn"))).click()
-        time.sleep(1)
-        location_input = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Add a location']")))
+        locate(driver, "location_filter", "filter").click()
+        location_input = locate(driver, "location_input", "filter", "visible")
         location_input.send_keys(location)
-        time.sleep(2)
-        driver.find_element(By.XPATH,f"//*[text()='{location.title()}']").click()
-        time.sleep(1)
-        driver.find_element(By.XPATH,"//button[@aria-label='Apply current filter to show results']").click()
-        time.sleep(3)
+        option = wait_for(driver, "filter", lambda d: d.execute_script(LOCATION_OPTION_SCRIPT, location))
+        print(Fore.YELLOW + f"[INFO] Location '{location}' matched '{option.text.strip()}'")
+        option.click()
+        current_url = driver.current_url
+        locate(driver, "apply_filter", "filter").click()
+        wait_for(driver, "results", EC.url_changes(current_url))
+        wait_for_dom_idle(driver, "results")
+        return geo_urn_from_url(driver.current_url)
     except Exception as e:
         print(Fore.RED + f"[INFO] Error selecting location: {e}")
+        return None
 
 def login_with_credentials(driver:webdriver.Chrome, email:str, password:str):
     print(Fore.YELLOW + "Logging in with credentials...")
+    mark_stage(driver, "login")
     driver.get("https://www.linkedin.com/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username")))
-    driver.find_element(By.ID, "username").send_keys(email)
-    driver.find_element(By.ID, "password").send_keys(password)
-    driver.find_element(By.XPATH, "//button[@type='submit']").click()
-    WebDriverWait(driver, 10).until(
-        lambda d: d.find_element(By.ID, "global-nav-typeahead") or 
+    locate(driver, "login_username", "login", "visible").send_keys(email)
+    locate(driver, "login_password", "login", "visible").send_keys(password)
+    locate(driver, "login_submit", "login").click()
+    wait_for(driver, "login",
+        lambda d: d.find_elements(*locators.best("global_nav")) or
         "Enter the code" in d.page_source
     )
     if "Enter the code" in driver.page_source:
         verification_code = input("[+] Enter the verification code sent to your email: ")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "input__email_verification_pin")))
-        driver.find_element(By.ID, "input__email_verification_pin").send_keys(verification_code)
-        driver.find_element(By.ID, "email-pin-submit-button").click()
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "global-nav-typeahead")))
+        locate(driver, "verification_pin", "login", "visible").send_keys(verification_code)
+        locate(driver, "verification_submit", "login").click()
+    locate(driver, "global_nav", "login", "present")
     print(Fore.GREEN + "[INFO] Logged in with credentials successfully.")
     save_cookie(driver)
 
 # --- Google Sheets Integration ---
-def get_profile_urls_from_sheet(sheet_url, column_name, creds_path):
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(creds_path, scope)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_url(sheet_url).sheet1
-    records = sheet.get_all_records()
-    urls = [row[column_name] for row in records if row.get(column_name)]
-    return urls
+def get_profile_urls_from_sheet(sheet_url, column_name, creds_path, limit=None):
+    return list(iter_profile_urls(SheetSource(sheet_url, column_name, creds_path), limit))
+
+# --- Profile page state classifier ---
+PROFILE_CONNECT_DIRECT = "connect-direct"
+PROFILE_CONNECT_IN_MORE_MENU = "connect-in-more-menu"
+PROFILE_PENDING = "pending"
+PROFILE_ALREADY_CONNECTED = "already-connected"
+PROFILE_FOLLOW_ONLY = "follow-only"
+PROFILE_UNAVAILABLE = "unavailable"
+
+# Reads the profile header once. Returns state "loading" until either the header or an
+# unavailable-page marker has rendered, so it doubles as the readiness condition.
+PROFILE_STATE_SCRIPT = """
+const text = el => (el.textContent || '').replace(/\\s+/g, ' ').trim();
+const bodyText = document.body ? document.body.innerText : '';
+if (/this page doesn.t exist|profile is not available|page not found/i.test(bodyText)
+        && !document.querySelector('main h1')) {
+    return {state: 'unavailable', fullName: ''};
+}
+const h1 = document.querySelector('main h1');
+if (!h1) return {state: 'loading', fullName: ''};
+const header = h1.closest('section') || document.querySelector('main');
+const buttons = Array.from(header.querySelectorAll('button'));
+const labelled = (b, word) => Array.from(b.querySelectorAll('span')).some(s => text(s) === word);
+const result = {fullName: text(h1), connectButton: null, moreButton: null};
+const visible = buttons.filter(b => !b.closest('[role="menu"], .artdeco-dropdown__content'));
+const connect = visible.find(b => labelled(b, 'Connect') && !b.disabled);
+const more = visible.find(b => labelled(b, 'More'));
+result.moreButton = more || null;
+if (visible.some(b => labelled(b, 'Pending') || /pending/i.test(b.getAttribute('aria-label') || ''))) {
+    result.state = 'pending';
+} else if (connect) {
+    result.state = 'connect-direct';
+    result.connectButton = connect;
+} else if (/\\b1st\\b/.test(text(header)) || Array.from(header.querySelectorAll('[aria-label]'))
+        .some(e => /remove connection/i.test(e.getAttribute('aria-label')))) {
+    result.state = 'already-connected';
+} else {
+    const menuItems = Array.from(header.querySelectorAll('[role="menu"] [role="menuitem"], [role="menu"] [role="button"], .artdeco-dropdown__content [role="button"]'));
+    const menuConnect = menuItems.some(i => /\\bconnect\\b/i.test(text(i) + ' ' + (i.getAttribute('aria-label') || '')));
+    const follow = visible.some(b => labelled(b, 'Follow'));
+    if (menuConnect || (more && menuItems.length === 0)) result.state = 'connect-in-more-menu';
+    else if (follow) result.state = 'follow-only';
+    else result.state = 'unavailable';
+}
+return result;
+"""
+
+def classify_profile(driver):
+    """Wait for the profile header to render, then classify it in a single script call"""
+    def header_state(d):
+        profile = d.execute_script(PROFILE_STATE_SCRIPT)
+        return profile if profile["state"] != "loading" else False
+    return wait_for(driver, "page_load", header_state)
+
+# --- Search results snapshot ---
+# Reads every result card in one round trip
+SEARCH_CARDS_SCRIPT = """
+const buttonText = arguments[0];
+const exhausted = Array.from(document.querySelectorAll('h2'))
+    .some(h => h.textContent.trim() === 'No free personalized invitations left');
+const buttons = Array.from(document.querySelectorAll('button')).filter(b =>
+    Array.from(b.querySelectorAll('span')).some(s => s.textContent.trim() === buttonText));
+const cards = buttons.map((button, index) => {
+    const container = button.closest('div.entity-result') || button.closest('li')
+        || button.closest('[class*="result"]');
+    const link = container && (container.querySelector('span.entity-result__title a[href*="/in/"]')
+        || container.querySelector('a[href*="/in/"]'));
+    let fullName = '';
+    if (link) {
+        const hidden = link.querySelector('span[aria-hidden="true"]');
+        fullName = (hidden ? hidden.textContent : (link.innerText || link.getAttribute('aria-label') || '')).trim();
+    }
+    let state = 'enabled';
+    if (button.disabled || button.getAttribute('aria-disabled') === 'true') state = 'disabled';
+    else if (/pending/i.test(button.getAttribute('aria-label') || '')) state = 'pending';
+    return {
+        index: index,
+        url: link ? link.href.split('?')[0] : null,
+        fullName: fullName,
+        state: state,
+        button: button,
+    };
+});
+return {invitationsExhausted: exhausted, cards: cards};
+"""
+
+def extract_search_cards(driver, button_text="Connect"):
+    """Snapshot all result cards on the current search page with a single script call"""
+    snapshot = driver.execute_script(SEARCH_CARDS_SCRIPT, button_text)
+    for card in snapshot["cards"]:
+        first = card["fullName"].split(" ")[0] if card["fullName"] else ""
+        card["firstName"] = first.title() if first else "Unknown"
+    return snapshot
+
+def refind_card_button(driver, url, button_text="Connect"):
+    """The button of the result card for url, after LinkedIn re-rendered the card (a stale handle)"""
+    from selenium.common.exceptions import NoSuchElementException
+    for card in extract_search_cards(driver, button_text)["cards"]:
+        if card["url"] == url:
+            return card["button"]
+    raise NoSuchElementException(f"Result card for {url} is no longer on the page")
+
+# --- Invitation limits ---
+# Looks for LinkedIn's limit and restriction messages in open dialogs and headings, in one script call
+LIMIT_STATE_SCRIPT = """
+const text = el => (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim();
+const patterns = [
+    ['restricted', /account (has been |is )?(temporarily )?restricted|restricted your account/i],
+    ['weekly-limit', /weekly invitation limit|reached the (weekly )?limit for (connection )?invitations|invitation limit/i],
+    ['notes-exhausted', /no free personalized invitations left|used all (of )?your free personalized invitations/i],
+];
+const scopes = Array.from(document.querySelectorAll('[role="dialog"], [role="alertdialog"], .artdeco-modal, h2'));
+for (const [kind, pattern] of patterns) {
+    for (const scope of scopes) {
+        const content = text(scope);
+        if (pattern.test(content)) return {kind: kind, text: content.slice(0, 200)};
+    }
+}
+return null;
+"""
+
+def check_invitation_limits(driver, budget=None):
+    """Record any limit LinkedIn is showing. Raises InvitationLimitReached for the ones that end the run and
+    returns LIMIT_NOTES_EXHAUSTED when only personalized notes are used up"""
+    found = run_script(driver, LIMIT_STATE_SCRIPT)
+    if not found:
+        return None
+    if budget is not None:
+        budget.hit(found["kind"], found["text"])
+    if found["kind"] in (LIMIT_WEEKLY, LIMIT_RESTRICTED):
+        raise InvitationLimitReached(found["kind"], found["text"])
+    if budget is not None and budget.on_notes_exhausted == "stop":
+        raise InvitationLimitReached(found["kind"], found["text"])
+    print(Fore.YELLOW + "[INFO] No free personalized invitations left, sending without a note.")
+    return found["kind"]
+
+class command_counter:
+    """Count the WebDriver commands issued inside a with-block"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+
+    def __enter__(self):
+        self._execute = self.driver.execute
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return self._execute(driver_command, params)
+        # WebElement methods go through their parent driver's execute(), so this sees those too
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, *exc):
+        self.driver.execute = self._execute
+        return False
 
 # --- Robust click helper ---
 def robust_click(driver, element):
@@ -110,222 +690,734 @@ def robust_click(driver, element):
         try:
             driver.execute_script("arguments[0].click();", element)
         except Exception:
+            from selenium.webdriver.common.action_chains import ActionChains
             ActionChains(driver).move_to_element(element).pause(0.5).click().perform()
 
 # --- UPDATED: Robust Connect Button Handling & Confirmation ---
-def send_connection_request_to_urls(driver, urls, letter, include_notes):
-    successful = 0
-    for url in urls:
-        try:
-            driver.get(url)
-            time.sleep(3)
-            wait = WebDriverWait(driver, 15)
-            connect_button = None
+def record_outcome(ledger, url, outcome, reason=""):
+    if ledger is not None:
+        ledger.record(url, outcome, reason)
+    run_log.outcome(url, outcome, reason)
+
+def failure_reason(error):
+    """Ledger reason for an error, naming the stage that ran out of retries"""
+    if isinstance(error, StageFailed):
+        return f"{error.stage}: {type(error.error).__name__} after {error.attempts} attempts"
+    return type(error).__name__
+
+def with_retries(driver, stage, action):
+    """Run action(attempt) under the stage's retry policy, noting every retry in the trace"""
+    def on_retry(attempt, error, delay):
+        print(Fore.YELLOW + f"[INFO] {type(error).__name__} in {stage}, retrying in {delay:.2f}s (attempt {attempt + 1})")
+        record_event(driver, "retry", {"stage": stage, "attempt": attempt, "error": type(error).__name__})
+        run_log.retry(stage)
+    return stage_retries.run(stage, action, on_retry)
 
-            # Try direct Connect button
+def click_connect_in_more_menu(driver, more_button=None):
+    """Open the More menu and click its Connect item; raises TimeoutException if the menu has no Connect"""
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    def open_menu(attempt):
+        if attempt > 1:
             try:
-                connect_button = wait.until(
-                    EC.presence_of_element_located((By.XPATH, "//button[.//span[text()='Connect'] and not(@disabled)]"))
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", connect_button)
-                driver.execute_script("window.scrollBy(0, -150);")  # Offset for sticky header
-                time.sleep(0.5)
+                # The menu may still be open from the failed attempt; clicking More again would close it
+                return locators.find(driver, "more_menu_connect", 0, "clickable")
+            except TimeoutException:
+                pass
+        button = more_button if attempt == 1 and more_button is not None else locate(driver, "more_button", "menu")
+        driver.execute_script("arguments[0].scrollIntoView(true);", button)
+        button.click()
+        return locate(driver, "more_menu_connect", "menu")
+
+    def click_item(attempt):
+        item = connect_menuitem if attempt == 1 else with_retries(driver, STAGE_LOCATE, lambda a: open_menu(2))
+        scroll_into_view(driver, item)
+        wait_for(driver, "click", EC.element_to_be_clickable(item))
+        robust_click(driver, item)
+
+    connect_menuitem = with_retries(driver, STAGE_LOCATE, open_menu)
+    with_retries(driver, STAGE_CLICK, click_item)
+
+def fill_note(driver, note):
+    """Open the note box in the invitation modal and type the note"""
+    from selenium.common.exceptions import TimeoutException
+
+    def fill(attempt):
+        message_box = None
+        if attempt > 1:
+            try:
+                message_box = locators.find(driver, "note_textarea", 0, "present")
+                message_box.clear()
+            except TimeoutException:
+                pass
+        if message_box is None:
+            locate(driver, "add_note", "modal").click()
+            message_box = locate(driver, "note_textarea", "modal", "present")
+        message_box.send_keys(note)
+    with_retries(driver, STAGE_NOTE, fill)
+
+def click_send(driver, with_note):
+    def send(attempt):
+        if with_note:
+            driver.execute_script("arguments[0].click();", locate(driver, "send_invitation", "click"))
+        else:
+            locate(driver, "send_without_note", "modal").click()
+    with_retries(driver, STAGE_SEND, send)
+
+def report_retries():
+    lines = stage_retries.report()
+    if lines:
+        print(Fore.CYAN + "[INFO] Retries per stage:")
+        for line in lines:
+            print("    " + line)
+
+def note_plan(letter):
+    """Compile the note template once, with the [Notes] fallbacks and length limit"""
+    fallbacks = [line.strip() for line in config.get('Notes', 'fallback', fallback='').splitlines() if line.strip()]
+    return compile_notes(letter, fallbacks, config.getint('Notes', 'max_length', fallback=DEFAULT_MAX_LENGTH))
+
+def connect_to_profile(driver, url, letter, include_notes, ledger=None, budget=None):
+    """Open one profile and send the invitation. Returns True only if the send was confirmed.
+
+    letter is a note template string or a compiled NotePlan. Raises InvitationLimitReached if LinkedIn reports
+    a weekly limit or a restriction.
+    """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    try:
+        mark_stage(driver, "navigate")
+        open_page(driver, url)
+        mark_stage(driver, "locate-connect")
+        profile = classify_profile(driver)
+        state = profile["state"]
+        note = None
+        if include_notes and state in (PROFILE_CONNECT_DIRECT, PROFILE_CONNECT_IN_MORE_MENU):
+            # Rendered and length-checked before anything is clicked
+            plan = note_plan(letter)
+            note = plan.render(profile["fullName"])
+            if note is None:
+                print(Fore.YELLOW + f"[INFO] No note template fits in {plan.max_length} characters, sending without a note: {url}")
+                include_notes = False
+
+        if state == PROFILE_CONNECT_DIRECT:
+            run_log.set_path(PATH_DIRECT)
+            def click_connect(attempt):
+                connect_button = profile["connectButton"] if attempt == 1 else locate(driver, "connect_button", "click")
+                scroll_into_view(driver, connect_button)
+                wait_for(driver, "click", EC.element_to_be_clickable(connect_button))
                 robust_click(driver, connect_button)
+            with_retries(driver, STAGE_CLICK, click_connect)
+        elif state == PROFILE_CONNECT_IN_MORE_MENU:
+            run_log.set_path(PATH_MORE_MENU)
+            try:
+                click_connect_in_more_menu(driver, profile["moreButton"])
             except TimeoutException:
-                # Try "More" menu
-                try:
-                    more_button = wait.until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[.//span[normalize-space()='More']]"))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", more_button)
-                    more_button.click()
-                    time.sleep(1)
-                    connect_menuitem = wait.until(
-                        EC.element_to_be_clickable((By.XPATH, "//div[@role='menu']//span[text()='Connect']/ancestor::*[@role='menuitem' or @role='button'][1]"))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", connect_menuitem)
-                    driver.execute_script("window.scrollBy(0, -150);")
-                    time.sleep(0.5)
-                    robust_click(driver, connect_menuitem)
-                except TimeoutException:
-                    print(Fore.RED + f"[INFO] Connect button not found, skipping profile: {url}")
-                    continue
-
-            time.sleep(2)
-            # --- Add note if needed ---
-            if include_notes:
-                try:
-                    add_note_button = wait.until(EC.element_to_be_clickable(
-                        (By.XPATH, '//button[@aria-label="Add a note"]')))
-                    add_note_button.click()
-                    message_box = wait.until(EC.presence_of_element_located(
-                        (By.XPATH, '//textarea[@name="message"]')))
-                    try:
-                        name_elem = driver.find_element(By.XPATH, "//h1[contains(@class,'text-heading-xlarge')]")
-                        name = name_elem.text.split(' ')[0]
-                    except Exception:
-                        name = "there"
-                    message_box.send_keys(letter.replace("{name}", name).replace("{fullName}", name))
-                    time.sleep(1)
-                    send_button = driver.find_element(By.XPATH, '//button[@aria-label="Send invitation"]')
-                    driver.execute_script("arguments[0].click();", send_button)
-                    time.sleep(2)
-                except Exception as e:
-                    print(Fore.YELLOW + f"Could not add a note: {e}")
-                    # Try sending without a note
-                    try:
-                        send_button = wait.until(EC.element_to_be_clickable(
-                            (By.XPATH, '//button[@aria-label="Send now" or @aria-label="Send without a note"]')))
-                        send_button.click()
-                        time.sleep(2)
-                    except Exception as e2:
-                        print(Fore.RED + f"Could not send invitation: {e2}")
-                        continue
-            else:
-                try:
-                    send_button = wait.until(EC.element_to_be_clickable(
-                        (By.XPATH, '//button[@aria-label="Send now" or @aria-label="Send without a note"]')))
-                    send_button.click()
-                    time.sleep(2)
-                except Exception as e:
-                    print(Fore.RED + f"Could not send invitation: {e}")
-                    continue
+                # The classifier cannot see lazily rendered menu items; an empty menu is a follow-only profile, which
+                # the ledger retries after its follow-only window rather than on every run
+                print(Fore.YELLOW + f"[INFO] No Connect in the More menu, skipping follow-only profile: {url}")
+                record_outcome(ledger, url, OUTCOME_FOLLOW_ONLY, "Connect not found in More menu")
+                return False
+        else:
+            print(Fore.YELLOW + f"[INFO] Profile is {state}, skipping: {url}")
+            record_outcome(ledger, url, state, "Profile state on load")
+            return False
 
-            # --- Confirmation check: Only count as successful if Connect button is gone ---
+        wait_for_modal(driver)
+        if check_invitation_limits(driver, budget) == LIMIT_NOTES_EXHAUSTED:
+            include_notes = False
+        note_sent = False
+        # --- Add note if needed ---
+        if include_notes:
             try:
-                driver.find_element(By.XPATH, "//button[.//span[text()='Connect']]")
-                print(Fore.RED + f"[INFO] Connection request may NOT have been sent for {url} (Connect button still present).")
-                continue
-            except:
-                print(Fore.GREEN + f"[INFO] Connection request sent successfully to {url}")
-                successful += 1
-                print("---------------------------------------------------------------------------------------------------------------")
-            time.sleep(2)
-        except StaleElementReferenceException:
-            print(Fore.YELLOW + f"[INFO] Stale element, retrying profile: {url}")
+                mark_stage(driver, "add-note")
+                fill_note(driver, note)
+                mark_stage(driver, "send")
+                click_send(driver, with_note=True)
+                wait_for_modal_closed(driver)
+                note_sent = True
+            except Exception as e:
+                if is_session_lost(e):
+                    raise
+                print(Fore.YELLOW + f"Could not add a note: {e}")
+                check_invitation_limits(driver, budget)
+                # Try sending without a note
+                try:
+                    mark_stage(driver, "send")
+                    click_send(driver, with_note=False)
+                    wait_for_modal_closed(driver)
+                except Exception as e2:
+                    if is_session_lost(e2):
+                        raise
+                    print(Fore.RED + f"Could not send invitation: {e2}")
+                    record_outcome(ledger, url, OUTCOME_FAILED, f"Send failed: {failure_reason(e2)}")
+                    return False
+        else:
+            try:
+                mark_stage(driver, "send")
+                click_send(driver, with_note=False)
+                wait_for_modal_closed(driver)
+            except Exception as e:
+                if is_session_lost(e):
+                    raise
+                print(Fore.RED + f"Could not send invitation: {e}")
+                record_outcome(ledger, url, OUTCOME_FAILED, f"Send failed: {failure_reason(e)}")
+                return False
+
+        # --- Confirmation check: Only count as successful once the profile header shows Pending ---
+        # Read from the header alone, so Connect buttons on "People also viewed" cards do not count
+        mark_stage(driver, "confirm")
+        try:
+            wait_for(driver, "confirm", lambda d: d.execute_script(PROFILE_STATE_SCRIPT)["state"] == PROFILE_PENDING)
+        except TimeoutException:
+            check_invitation_limits(driver, budget)
+            print(Fore.RED + f"[INFO] Connection request may NOT have been sent for {url} (profile not marked Pending).")
+            record_outcome(ledger, url, OUTCOME_NOT_CONFIRMED, "Profile not marked Pending")
+            return False
+        print(Fore.GREEN + f"[INFO] Connection request sent successfully to {url}")
+        record_outcome(ledger, url, OUTCOME_SENT, SENT_WITH_NOTE if note_sent else SENT_WITHOUT_NOTE)
+        print("---------------------------------------------------------------------------------------------------------------")
+        return True
+    except InvitationLimitReached as e:
+        record_outcome(ledger, url, OUTCOME_FAILED, f"Invitation limit: {e.kind}")
+        raise
+    except StageFailed as e:
+        # Transient errors are retried inside the stage; this is only reached once its attempts are used up
+        print(Fore.YELLOW + f"[INFO] Giving up on {url}: {e}")
+        record_outcome(ledger, url, OUTCOME_FAILED, failure_reason(e))
+        return False
+    except Exception as e:
+        if is_session_lost(e):
+            raise
+        print(Fore.RED + f"[INFO] Failed to send request to {url}: {e}")
+        record_outcome(ledger, url, OUTCOME_FAILED, type(e).__name__)
+        return False
+
+def govern_memory(driver, governor, session=None):
+    """Every few profiles, sample browser memory into the trace and recycle the tab or the browser when a
+    watermark is crossed. Returns the driver to continue with"""
+    if governor is None or not governor.due():
+        return driver
+    try:
+        sample, action = governor.check(driver)
+    except Exception as e:
+        if is_session_lost(e):
+            raise
+        print(Fore.YELLOW + f"[INFO] Memory sample failed: {e}")
+        return driver
+    record_event(driver, "memory", sample)
+    rss = f", RSS {sample['rssMb']:.0f} MB" if sample["rssMb"] is not None else ""
+    print(Fore.CYAN + f"[INFO] Browser memory after {sample['profiles']} profiles: heap {sample['heapUsedMb']:.0f} MB, {sample['nodes']} DOM nodes{rss}")
+    if action == ACTION_RESTART and session is not None:
+        print(Fore.YELLOW + "[INFO] Memory watermark crossed, restarting the browser")
+        return session.restart(planned=True)
+    if action in (ACTION_NEW_TAB, ACTION_RESTART):
+        # Without a session to restart, a fresh tab is the most that can be done
+        print(Fore.YELLOW + "[INFO] Memory watermark crossed, continuing in a fresh tab")
+        open_fresh_tab(driver)
+    return driver
+
+def write_status(status_writer, ledger, row, url, sent):
+    """Queue the profile's outcome for the sheet, taking outcome and reason from the ledger when there is one"""
+    if status_writer is None:
+        return
+    entry = ledger.lookup(url) if ledger is not None else None
+    if entry is not None:
+        status_writer.record(row, entry["outcome"], entry["reason"] or "")
+    else:
+        status_writer.record(row, OUTCOME_SENT if sent else OUTCOME_FAILED)
+
+def send_connection_request_to_urls(driver, urls, letter, include_notes, ledger=None, journal=None, session=None, limit=None, budget=None, governor=None,
+                                    status_writer=None):
+    """Process profile URLs in order. urls may yield plain URLs or (row_number, url) pairs.
+
+    Progress is appended to journal after every profile. If the WebDriver session dies and a session is
+    given, the browser is restarted and the profile is tried again. With a budget, the run stops before
+    opening a profile once the budget is spent or LinkedIn has reported a limit. With a status_writer, each
+    row's outcome is queued for the sheet and flushed in batches, and once more on the way out.
+    """
+    try:
+        return _send_to_urls(driver, urls, letter, include_notes, ledger, journal, session, limit, budget, governor, status_writer)
+    finally:
+        if status_writer is not None:
+            status_writer.flush()
+
+def _send_to_urls(driver, urls, letter, include_notes, ledger, journal, session, limit, budget, governor, status_writer):
+    if include_notes:
+        letter = note_plan(letter)
+    resume = journal.resume_point() if journal is not None else None
+    successful = resume["successful"] if resume else 0
+    processed = resume["processed"] if resume else 0
+    stopped = False
+    for position, item in enumerate(urls, start=1):
+        row, url = item if isinstance(item, tuple) else (position, item)
+        if ledger is not None and ledger.should_skip(url):
+            print(Fore.YELLOW + f"[INFO] Already processed, skipping: {url}")
             continue
-        except Exception as e:
-            print(Fore.RED + f"[INFO] Failed to send request to {url}: {e}")
+        notes = include_notes
+        if budget is not None:
+            reason = budget.stop_reason(include_notes)
+            if reason:
+                print(Fore.RED + f"[INFO] Stopping before {url}: {reason}")
+                stopped = True
+                break
+            notes = include_notes and budget.notes_allowed()
+        begin_profile(driver, url)
+        try:
+            try:
+                sent = connect_to_profile(driver, url, letter, notes, ledger, budget)
+            except Exception as e:
+                if session is None or not is_session_lost(e):
+                    raise
+                print(Fore.YELLOW + f"[INFO] Browser session lost ({type(e).__name__}), restarting and retrying: {url}")
+                driver = session.restart()
+                begin_profile(driver, url)
+                sent = connect_to_profile(driver, url, letter, notes, ledger, budget)
+        except InvitationLimitReached as e:
+            print(Fore.RED + f"[INFO] Stopping, LinkedIn reported {e.kind}: {e.reason}")
+            write_status(status_writer, ledger, row, url, False)
+            stopped = True
+            break
+        successful += sent
+        processed += 1
+        write_status(status_writer, ledger, row, url, sent)
+        if journal is not None:
+            journal.record(row=row, processed=processed, successful=successful, limit=limit)
+        driver = govern_memory(driver, governor, session)
+    end_profile(driver)
+    # A run stopped by the budget is left unfinished so the next one resumes from the same row
+    if journal is not None and not stopped:
+        journal.finish(processed=processed, successful=successful, limit=limit)
+    report_notes(letter if include_notes else None)
     print(Fore.YELLOW + f"Total successful connections: {successful}")
+    return successful
 
 # --- Existing robust search-based connection logic (unchanged) ---
-def send_connection_request(driver: webdriver.Chrome, limit: int, letter: str, include_notes: bool, message_letter: str):
-    successful_connections = 0
-    while successful_connections < limit:
+def send_connection_request(driver: webdriver.Chrome, limit: int, letter: str, include_notes: bool, message_letter: str, journal=None, session=None, ledger=None, budget=None):
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.common.action_chains import ActionChains
+    resume = journal.resume_point() if journal is not None else None
+    successful_connections = resume["successful"] if resume else 0
+    page = resume["page"] if resume else 1
+    page_url = None
+    button_text = "Connect" if message_letter == "" else "Message"
+    plan = note_plan(letter) if include_notes else None
+    stop_reason = None
+    # Set when the results run out, which finishes the batch just as reaching the limit does
+    last_page = False
+    while successful_connections < limit and stop_reason is None:
         try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            try:
-                driver.find_element(By.XPATH, "//h2[text()='No free personalized invitations left']")
-                print(Fore.RED + "[ERROR] No free personalized invitations left.")
-                return
-            except:
-                pass
-            if message_letter == "":
-                connect_buttons = driver.find_elements(By.XPATH, "//*[text()='Connect']/..")
-            else:
-                connect_buttons = driver.find_elements(By.XPATH, "//*[text()='Message']/..")
-            print(f"Number of connect buttons found: {len(connect_buttons)}")
-            if not connect_buttons:
-                print("No connect buttons found, moving to next page...")
-                try:
-                    driver.find_element(By.XPATH, "//button[@aria-label='Next']").click()
-                    time.sleep(2)
-                    continue
-                except:
-                    print("No next page available")
-                    break
-            for i, connect_button in enumerate(connect_buttons):
-                if successful_connections >= limit:
-                    break
-                try:
-                    actions = ActionChains(driver)
-                    if message_letter == "":
+            page_url = driver.current_url
+            if journal is not None:
+                journal.record(page=page, url=page_url, successful=successful_connections, limit=limit)
+            with command_counter(driver) as commands:
+                end_profile(driver)
+                mark_stage(driver, "navigate")
+                # Scroll to load the lazy cards and wait for them to settle, in one batch when DevTools is attached
+                run_scripts(driver, [("window.scrollTo(0, document.body.scrollHeight);", (), False),
+                                     (DOM_IDLE_SCRIPT, (300, int(step_timeout("results") * 1000)), True)])
+                mark_stage(driver, "locate-connect")
+                snapshot = extract_search_cards(driver, button_text)
+                if snapshot["invitationsExhausted"] and include_notes:
+                    print(Fore.RED + "[ERROR] No free personalized invitations left.")
+                    if budget is not None:
+                        budget.hit(LIMIT_NOTES_EXHAUSTED, "No free personalized invitations left")
+                    if budget is None or budget.on_notes_exhausted == "stop":
+                        report_notes(plan)
+                        return successful_connections
+                    print(Fore.YELLOW + "[INFO] Continuing without notes.")
+                elif snapshot["invitationsExhausted"] and budget is not None:
+                    # Note-free invitations are unaffected; remember it for runs that do send notes
+                    budget.hit(LIMIT_NOTES_EXHAUSTED, "No free personalized invitations left")
+                cards = snapshot["cards"]
+                print(f"Number of connect buttons found: {len(cards)}")
+                if not cards:
+                    print("No connect buttons found, moving to next page...")
+                    try:
+                        click_next_page(driver)
+                        page += 1
+                        continue
+                    except Exception as e:
+                        if is_session_lost(e):
+                            raise
+                        print("No next page available")
+                        last_page = True
+                        break
+                for card in cards:
+                    if successful_connections >= limit:
+                        break
+                    if message_letter != "":
+                        continue
+                    if not card["url"] or card["state"] != "enabled":
+                        print(f"Skipping card {card['index']}: state={card['state']}, url={card['url']}")
+                        continue
+                    if ledger is not None and ledger.should_skip(card["url"]):
+                        print(Fore.YELLOW + f"[INFO] Already processed, skipping: {card['url']}")
+                        continue
+                    notes = include_notes
+                    if budget is not None:
+                        stop_reason = budget.stop_reason(include_notes)
+                        if stop_reason:
+                            break
+                        notes = include_notes and budget.notes_allowed()
+                    note = plan.render(card["fullName"]) if notes else None
+                    if notes and note is None:
+                        print(Fore.YELLOW + f"[INFO] No note template fits in {plan.max_length} characters, sending without a note: {card['url']}")
+                        notes = False
+                    begin_profile(driver, card["url"])
+                    run_log.set_path(PATH_SEARCH_CARD)
+                    mark_stage(driver, "locate-connect")
+                    try:
+                        linkedin_url = card["url"]
+                        def click_connect(attempt, card=card):
+                            # A re-rendered card is a new node, so it is found again by its profile URL
+                            connect_button = card["button"] if attempt == 1 else with_retries(
+                                driver, STAGE_LOCATE, lambda a: refind_card_button(driver, card["url"], button_text))
+                            ActionChains(driver).move_to_element(connect_button).perform()
+                            wait_for(driver, "click", EC.element_to_be_clickable(connect_button))
+                            connect_button.click()
+                        with_retries(driver, STAGE_CLICK, click_connect)
+                        wait_for_modal(driver)
+                        if check_invitation_limits(driver, budget) == LIMIT_NOTES_EXHAUSTED:
+                            notes = False
+                        if notes:
+                            mark_stage(driver, "add-note")
+                            fill_note(driver, note)
+                        mark_stage(driver, "send")
+                        click_send(driver, with_note=notes)
+                        mark_stage(driver, "confirm")
+                        wait_for_modal_closed(driver)
+                        record_outcome(ledger, linkedin_url, OUTCOME_SENT, SENT_WITH_NOTE if notes else SENT_WITHOUT_NOTE)
+                        successful_connections += 1
+                        if journal is not None:
+                            journal.record(page=page, url=page_url, successful=successful_connections, limit=limit)
+                        print(Fore.GREEN + f"[INFO] Connection request sent successfully to {linkedin_url}")
+                        print("---------------------------------------------------------------------------------------------------------------")
+                    except InvitationLimitReached as e:
+                        record_outcome(ledger, card["url"], OUTCOME_FAILED, f"Invitation limit: {e.kind}")
+                        stop_reason = f"LinkedIn reported {e.kind}: {e.reason}"
+                        break
+                    except Exception as e:
+                        if is_session_lost(e):
+                            raise
+                        print(f"Error with button {card['index']}: {e}")
+                        record_outcome(ledger, card["url"], OUTCOME_FAILED, failure_reason(e))
                         try:
-                            connect_container = connect_button.find_element(By.XPATH, "./ancestor::div[contains(@class, 'entity-result')]")
-                            linkedin_container = connect_container.find_element(By.XPATH, ".//a[contains(@href, '/in/')]")
-                            linkedin_url = linkedin_container.get_attribute('href')
-                            name = linkedin_container.text.split(' ')[0].title()
-                        except Exception as e:
-                            print(f"Method 1 failed, trying Method 2: {e}")
-                            try:
-                                connect_container = connect_button.find_element(By.XPATH, "./ancestor::li")
-                                linkedin_container = connect_container.find_element(By.XPATH, ".//span[contains(@class, 'entity-result__title')]//a")
-                                linkedin_url = linkedin_container.get_attribute('href')
-                                name = linkedin_container.text.split(' ')[0].title()
-                            except Exception as e2:
-                                print(f"Method 2 also failed, trying Method 3: {e2}")
-                                try:
-                                    connect_container = connect_button.find_element(By.XPATH, "./ancestor::*[contains(@class, 'result')]")
-                                    linkedin_container = connect_container.find_element(By.XPATH, ".//a[contains(@href, 'linkedin.com/in/')]")
-                                    linkedin_url = linkedin_container.get_attribute('href')
-                                    name = linkedin_container.get_attribute('aria-label') or linkedin_container.text
-                                    if name:
-                                        name = name.split(' ')[0].title()
-                                    else:
-                                        name = "Unknown"
-                                except Exception as e3:
-                                    print(f"All methods failed for button {i}: {e3}")
-                                    continue
-                        actions.move_to_element(connect_button).perform()
-                        time.sleep(1)
-                        connect_button.click()
-                        time.sleep(1)
-                        if not include_notes:
-                            WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH, '//button[@aria-label="Send without a note"]'))).click()
-                        else:
-                            add_note_button = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH, '//button[@aria-label="Add a note"]')))
-                            add_note_button.click()
-                            message_box = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH, '//textarea[@name="message"]')))
-                            message_box.send_keys(letter.replace("{name}", name).replace("{fullName}", name))
-                            time.sleep(1)
-                            send_button = driver.find_element(By.XPATH, '//button[@aria-label="Send invitation"]')
-                            driver.execute_script("arguments[0].click();", send_button)
-                    successful_connections += 1
-                    print(Fore.GREEN + f"[INFO] Connection request sent successfully to {linkedin_url}")
-                    print("---------------------------------------------------------------------------------------------------------------")
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"Error with button {i}: {e}")
-                    continue
+                            check_invitation_limits(driver, budget)
+                        except InvitationLimitReached as e2:
+                            stop_reason = f"LinkedIn reported {e2.kind}: {e2.reason}"
+                            break
+                        continue
+            print(Fore.CYAN + f"[INFO] Results page {page}: {len(cards)} cards, {commands.count} WebDriver commands")
+            if stop_reason:
+                print(Fore.RED + f"[INFO] Stopping: {stop_reason}")
+                break
             if successful_connections < limit:
                 try:
-                    driver.find_element(By.XPATH, "//button[@aria-label='Next']").click()
-                    time.sleep(1)
-                except:
+                    end_profile(driver)
+                    mark_stage(driver, "navigate")
+                    click_next_page(driver)
+                    page += 1
+                except Exception as e:
+                    if is_session_lost(e):
+                        raise
                     print("No more pages available")
+                    last_page = True
                     break
         except Exception as e:
+            if session is not None and page_url and is_session_lost(e):
+                print(Fore.YELLOW + f"[INFO] Browser session lost ({type(e).__name__}), restarting at results page {page}")
+                driver = session.restart()
+                driver.get(page_url)
+                wait_for_page_ready(driver)
+                continue
             print(Fore.RED + f"[INFO] Error occurred: {e}")
             break
+    end_profile(driver)
+    if journal is not None and (successful_connections >= limit or last_page):
+        journal.finish(page=page, successful=successful_connections, limit=limit)
+    report_notes(plan)
+    return successful_connections
+
+def save_locator_stats():
+    locators.save()
+    for name, strategy, tries in locators.dead_strategies():
+        print(Fore.YELLOW + f"[INFO] Locator strategy for '{name}' has failed all {tries} tries: {strategy}")
+
+def start_trace(driver):
+    """Attach a command tracer writing to traces/run-<timestamp>.jsonl unless disabled in setup.ini"""
+    if not config.getboolean('Trace', 'enabled', fallback=True):
+        return None
+    directory = config.get('Trace', 'directory', fallback='traces')
+    tracer = CommandTracer(os.path.join(directory, f"run-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"))
+    tracer.attach(driver)
+    return tracer
+
+def finish_trace(tracer):
+    if tracer is None:
+        return
+    tracer.close()
+    summary_path = tracer.trace_path[:-len('.jsonl')] + '-summary.json'
+    tracer.write_summary(summary_path)
+    textfile = config.get('Trace', 'prometheus_textfile', fallback='')
+    if textfile:
+        tracer.write_prometheus(textfile)
+    summary = tracer.summary()
+    print(Fore.CYAN + f"[INFO] {summary['commands']} WebDriver commands over {summary['profiles']} profiles "
+          f"(p50 {summary['profile_ms_p50']} ms, p95 {summary['profile_ms_p95']} ms per profile)")
+    for stage, data in summary['stages'].items():
+        print(f"    {stage:<15} commands={data['commands']:<5} command p50/p95={data['command_ms_p50']}/{data['command_ms_p95']} ms"
+              f"  profile p50/p95={data['profile_ms_p50']}/{data['profile_ms_p95']} ms")
+    if 'memory' in summary:
+        memory = summary['memory']
+        print(f"    memory          heap {memory['heap_mb_first']} -> {memory['heap_mb_last']} MB (peak {memory['heap_mb_peak']}), "
+              f"peak {memory['nodes_peak']} DOM nodes, recycled {memory['recycled']} times over {memory['samples']} samples")
+    print(Fore.CYAN + f"[INFO] Trace written to {tracer.trace_path}, summary to {summary_path}")
+
+def open_budget(ledger, limit, uses_notes=True):
+    """Budget for this run, or None if nothing may be sent right now (checked before the browser starts)"""
+    budget = budget_from_config(config, ledger)
+    print(Fore.YELLOW + f"[INFO] Invitation budget: {budget.describe()}")
+    reason = budget.stop_reason(uses_notes)
+    if reason:
+        print(Fore.RED + f"[INFO] Not starting: {reason}")
+        return None
+    remaining = budget.remaining()
+    if remaining is not None and remaining < limit:
+        print(Fore.YELLOW + f"[INFO] The budget allows {remaining} more invitations; the run will stop there.")
+    return budget
+
+def report_notes(plan):
+    if plan is not None and (plan.fallbacks_used or plan.too_long):
+        print(Fore.CYAN + f"[INFO] Notes: {plan.fallbacks_used} used a fallback template, {plan.too_long} sent without a note "
+              f"(no template fit in {plan.max_length} characters)")
+
+def ask_note_template(prompt):
+    """Prompt until the note template compiles"""
+    while True:
+        letter = input(Fore.MAGENTA + prompt + Fore.RESET)
+        try:
+            note_plan(letter)
+            return letter
+        except TemplateError as e:
+            print(Fore.RED + f"[ERROR] {e}")
+
+def settings_digest():
+    """Settings that can change how a run performs (everything but the [LinkedIn] credentials) and their digest"""
+    import hashlib
+    settings = {section: dict(config[section]) for section in config.sections() if section != 'LinkedIn'}
+    return settings, hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+
+def open_run_log(flow, label, job=None):
+    if not config.getboolean('Runs', 'enabled', fallback=True):
+        return
+    settings, digest = settings_digest()
+    run_log.open(config.get('Runs', 'directory', fallback='runs'), flow, label, job, settings, digest)
+    print(Fore.CYAN + f"[INFO] Recording profiles to {run_log.path}")
+
+def open_ledger():
+    return OutcomeLedger(config.get('Ledger', 'path', fallback='ledger.db'), retry_policy_from_config(config))
+
+def run_list_job(session, ledger, budget, location, column_name, creds_path, letter, include_notes, limit, job=None):
+    """Send to the profiles in a Google Sheet or local file through the session's browser; returns the number sent"""
+    source = open_source(location, column_name, creds_path, page_size=config.getint('Sources', 'page_size', fallback=500))
+    journal = ProgressJournal.for_run(config.get('Checkpoint', 'directory', fallback='checkpoints'), "urls", location, column_name, limit)
+    resume = journal.resume_point()
+    if resume:
+        print(Fore.YELLOW + f"[INFO] Resuming after row {resume['row']}: {resume['processed']} profiles processed, {resume['successful']} sent.")
+    stats = {}
+    profile_rows = iter_profile_rows(source, limit - (resume['processed'] if resume else 0), skip=ledger.should_skip,
+                                     stats=stats, start_row=resume['row'] if resume else 0)
+    status_writer = None
+    if isinstance(source, SheetSource) and config.getboolean('Sheet', 'write_back', fallback=True):
+        try:
+            status_writer = SheetStatusWriter(source, config.getint('Sheet', 'flush_every', fallback=25)).open()
+        except Exception as e:
+            print(Fore.YELLOW + f"[INFO] Not writing statuses back to the sheet: {e}")
+    print(Fore.YELLOW + "[INFO] Streaming profile URLs from the list. Sending requests (up to your limit)...")
+    open_run_log("list", location, job)
+    try:
+        successful = send_connection_request_to_urls(session.driver, profile_rows, letter, include_notes, ledger=ledger, journal=journal,
+                                                     session=session, limit=limit, budget=budget,
+                                                     governor=memory_governor_from_config(config), status_writer=status_writer)
+    finally:
+        run_log.close()
+        journal.close()
+    print(Fore.YELLOW + f"[INFO] Rows read: {stats['rows']}, already processed: {stats['skipped']}, duplicates: {stats['duplicates']}, invalid: {stats['invalid']}")
+    return successful
+
+def run_search_job(session, ledger, budget, keyword, location, connection_degree, letter, include_notes, message_letter, limit, job=None):
+    """Search people and send to the results through the session's browser; returns the number sent"""
+    driver = session.driver
+    geo_cache = GeoUrnCache(config.get('Search', 'geo_cache', fallback='geo_cache.json'))
+    geo_urn = geo_cache.get(location) if location != "" else None
+    search_url = build_search_url(keyword, connection_degree, geo_urn)
+    journal = ProgressJournal.for_run(config.get('Checkpoint', 'directory', fallback='checkpoints'), "search", keyword, location, connection_degree, limit)
+    try:
+        resume = journal.resume_point()
+        mark_stage(driver, "navigate")
+        if resume:
+            print(Fore.YELLOW + f"[INFO] Resuming at results page {resume['page']} with {resume['successful']} requests already sent: {resume['url']}")
+            driver.get(resume['url'])
+            locate(driver, "global_nav", "page_load", "present")
+        else:
+            print(Fore.YELLOW + f"[INFO] Navigating to search URL: {search_url}")
+            open_page(driver, search_url)
+            locate(driver, "global_nav", "page_load", "present")
+            if geo_urn:
+                print(Fore.YELLOW + f"[INFO] Using cached geoUrn {geo_urn} for '{location}'")
+            elif location != "":
+                geo_urn = select_location(driver, location)
+                if geo_urn:
+                    geo_cache.put(location, geo_urn)
+        open_run_log("search", f"{keyword} {location}".strip(), job)
+        return send_connection_request(driver=driver, limit=limit, letter=letter, include_notes=include_notes, message_letter=message_letter,
+                                       journal=journal, session=session, ledger=ledger, budget=budget)
+    finally:
+        run_log.close()
+        journal.close()
+
+def browser_alive(driver):
+    if driver is None:
+        return False
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+def run_jobs(path):
+    """Run every job in the job file in order through one browser and one login, writing a report per job.
+    Returns the process exit code"""
+    try:
+        jobs = load_jobs(path)
+    except JobError as e:
+        print(Fore.RED + f"[ERROR] {e}")
+        return 2
+    problems = []
+    for job in jobs:
+        try:
+            if job.note:
+                note_plan(job.note)
+        except TemplateError as e:
+            problems.append(f"[{job.name}] {e}")
+    if problems:
+        print(Fore.RED + "[ERROR] " + "\n".join(problems))
+        return 2
+    li_at = config.get('LinkedIn', 'li_at', fallback='').strip()
+    if not li_at:
+        print(Fore.RED + f"[ERROR] The job runner logs in with [LinkedIn] li_at from {config_file}; it is not set.")
+        return 2
+    print(Fore.CYAN + f"[-] LinkedIn Auto Connector - {len(jobs)} jobs from {path}")
+    ledger = open_ledger()
+    session = None
+    reports = []
+    abort = False
+    try:
+        for number, job in enumerate(jobs, start=1):
+            print(Fore.CYAN + f"[JOB {number}/{len(jobs)}] {job.name}: {job.describe()}")
+            started = time.time()
+            report = {"job": job.name, "flow": job.flow, "limit": job.limit, "started": started, "sent": 0}
+            budget = open_budget(ledger, job.limit, bool(job.note))
+            if budget is None:
+                report["status"] = "skipped"
+                report["reason"] = "Invitation budget exhausted"
+            else:
+                try:
+                    if session is None:
+                        # Started lazily so a queue the budget rules out entirely never opens a browser
+                        session = BrowserSession(li_at)
+                        session.start()
+                    if job.flow == FLOW_LIST:
+                        sent = run_list_job(session, ledger, budget, job.source, job.column, job.credentials, job.note, bool(job.note), job.limit,
+                                            job=job.name)
+                    else:
+                        sent = run_search_job(session, ledger, budget, job.keyword, job.location, job.degree, job.note, bool(job.note), "", job.limit,
+                                              job=job.name)
+                    report["sent"] = sent or 0
+                    reason = budget.stop_reason(bool(job.note))
+                    report["status"] = "stopped" if reason else "done"
+                    if reason:
+                        report["reason"] = reason
+                except Exception as e:
+                    print(Fore.RED + f"[ERROR] Job {job.name} failed: {e}")
+                    report["status"] = "error"
+                    report["reason"] = f"{type(e).__name__}: {e}"
+                    if session is not None and not browser_alive(session.driver):
+                        # Give the remaining jobs a working browser, or stop the queue if none can be had
+                        try:
+                            session.restart()
+                        except Exception as restart_error:
+                            print(Fore.RED + f"[ERROR] Could not restart the browser, stopping the queue: {restart_error}")
+                            abort = True
+            report["seconds"] = round(time.time() - started, 1)
+            counts = {outcome: ledger.count_since(outcome, started) for outcome in OUTCOMES}
+            report["outcomes"] = {outcome: count for outcome, count in counts.items() if count}
+            reports.append(report)
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in report["outcomes"].items()) or "no profiles"
+            print(Fore.CYAN + f"[JOB {number}/{len(jobs)}] {job.name}: {report['status']}, {report['sent']}/{job.limit} sent "
+                  f"in {report['seconds']:.0f}s ({outcomes})" + (f" - {report['reason']}" if 'reason' in report else ""))
+            if abort:
+                break
+    finally:
+        if session is not None:
+            session.close()
+        ledger.close()
+        if reports:
+            report_path = write_job_reports(config.get('Jobs', 'report_directory', fallback='reports'), reports)
+            print(Fore.CYAN + f"[INFO] Job reports written to {report_path}")
+    return 1 if any(r["status"] == "error" for r in reports) else 0
+
+def show_report(directory=None, last=None, since_days=None, json_path=None):
+    """Print throughput, stage latency, outcome and per-run trends from the recorded runs. Returns the exit code"""
+    directory = directory or config.get('Runs', 'directory', fallback='runs')
+    runs = load_runs(directory)
+    if since_days is not None:
+        runs = [run for run in runs if run["run"]["ts"] >= time.time() - since_days * 86400]
+    if last:
+        runs = runs[-last:]
+    if not runs:
+        print(Fore.YELLOW + f"[INFO] No recorded runs in {directory}")
+        return 1
+    summary = summarize(runs)
+    print(Fore.CYAN + f"[-] LinkedIn Auto Connector - report over {directory}")
+    for line in format_report(summary):
+        print(line)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(Fore.CYAN + f"[INFO] Report written to {json_path}")
+    return 0
 
-def main():
+def run_interactive():
     print(Fore.CYAN + "[-] LinkedIn Auto Connector - Enhanced with Google Sheets Option")
-    use_sheet = input(Fore.MAGENTA + "[+] Do you want to import LinkedIn profile URLs from a Google Sheet? (y/n): " + Fore.RESET).strip().lower()
+    use_sheet = input(Fore.MAGENTA + "[+] Do you want to import LinkedIn profile URLs from a Google Sheet or a CSV/JSONL/XLSX file? (y/n): " + Fore.RESET).strip().lower()
     message = ''
     message_letter = ''
     include_note = False
     if use_sheet == 'y':
-        sheet_url = input(Fore.MAGENTA + "[+] Enter your Google Sheet URL: " + Fore.RESET).strip()
+        sheet_url = input(Fore.MAGENTA + "[+] Enter your Google Sheet URL or local file path: " + Fore.RESET).strip()
         column_name = input(Fore.MAGENTA + "[+] Enter the column name containing LinkedIn profile URLs: " + Fore.RESET).strip()
-        creds_path = input(Fore.MAGENTA + "[+] Enter the path to your Google service account credentials JSON file: " + Fore.RESET).strip()
-        letter = input(Fore.MAGENTA + "[+] Enter the message letter for the connection request (use {name} for personalization): " + Fore.RESET)
+        creds_path = ''
+        if sheet_url.startswith("http"):
+            creds_path = input(Fore.MAGENTA + "[+] Enter the path to your Google service account credentials JSON file: " + Fore.RESET).strip()
+        letter = ask_note_template("[+] Enter the message letter for the connection request (use {name}, {fullName} for personalization): ")
         include_notes = input(Fore.MAGENTA + "[+] Do you want to include a note in the connection request? (y/n): " + Fore.RESET).strip().lower() == 'y'
         limit = int(input(Fore.MAGENTA + "[+] Enter the maximum number of connection requests to send: " + Fore.RESET))
         li_at = input(Fore.MAGENTA + "[+] Enter the li_at of Linkedin: " + Fore.RESET)
         print("----------------------------------------------------------------")
-        driver = setup_driver()
+        ledger = open_ledger()
+        budget = open_budget(ledger, limit, include_notes)
+        if budget is None:
+            ledger.close()
+            return
+        session = BrowserSession(li_at)
+        session.start()
         try:
-            login_with_cookie(driver, li_at)
-        except Exception as e:
-            print(Fore.RED + f"[INFO] Cookie login failed: {e}\n" + Fore.YELLOW + "Attempting login with credentials.")
-            email = config.get('LinkedIn', 'email')
-            password = config.get('LinkedIn', 'password')
-            login_with_credentials(driver, email, password)
-        profile_urls = get_profile_urls_from_sheet(sheet_url, column_name, creds_path)
-        print(Fore.YELLOW + f"[INFO] Found {len(profile_urls)} profile URLs in the sheet. Sending requests (up to your limit)...")
-        send_connection_request_to_urls(driver, profile_urls[:limit], letter, include_notes)
-        driver.quit()
+            run_list_job(session, ledger, budget, sheet_url, column_name, creds_path, letter, include_notes, limit)
+        finally:
+            ledger.close()
+            session.close()
         return
     # --- Existing flow ---
     connection_degree = input(Fore.MAGENTA + "[+] Enter the connection degree (1st, 2nd, 3rd): " + Fore.RESET)
@@ -340,34 +1432,48 @@ def main():
         include_note = input(Fore.MAGENTA + "[+] Do you want to include a note in the connection request? (y/n): " + Fore.RESET)
         if include_note.lower() == 'y':
             include_note = True
-            message = input(Fore.MAGENTA + "[+] Enter the personalized message to send with connection requests: " + Fore.RESET)
+            message = ask_note_template("[+] Enter the personalized message to send with connection requests: ")
         else:
             include_note = False
     limit = int(input(Fore.MAGENTA + "[+] Enter the maximum number of connection requests to send: " + Fore.RESET))
     li_at = input(Fore.MAGENTA + "[+] Enter the li_at of Linkedin: " + Fore.RESET)
     print("----------------------------------------------------------------")
-    driver = setup_driver()
+    ledger = open_ledger()
+    budget = open_budget(ledger, limit, include_note)
+    if budget is None:
+        ledger.close()
+        return
+    session = BrowserSession(li_at)
+    session.start()
     try:
-        login_with_cookie(driver, li_at)
-    except Exception as e:
-        print(Fore.RED + f"[INFO] Cookie login failed: {e}\n" + Fore.YELLOW + "Attempting login with credentials.")
-        email = config.get('LinkedIn', 'email')
-        password = config.get('LinkedIn', 'password')
-        login_with_credentials(driver, email, password)
-    network_mapping = {
-        "1st": "%5B%22F%22%5D",  
-        "2nd": "%5B%22S%22%5D",  
-        "3rd": "%5B%22O%22%5D"   
-    }
-    network_code = network_mapping.get(connection_degree, "")
-    search_url = f"https://www.linkedin.com/search/results/people/?keywords={keyword.replace(' ','%20').lower()}&locations={location.replace(' ','%20')}&network={network_code}&origin=FACETED_SEARCH"
-    print(Fore.YELLOW + f"[INFO] Navigating to search URL: {search_url}")
-    driver.get(search_url)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "global-nav-typeahead")))
-    if location != "":
-        select_location(driver, location)
-    send_connection_request(driver=driver, limit=limit, letter=message, include_notes=include_note, message_letter=message_letter)
-    driver.quit()
+        run_search_job(session, ledger, budget, keyword, location, connection_degree, message, include_note, message_letter, limit)
+    finally:
+        ledger.close()
+        session.close()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Send LinkedIn connection requests from a profile list or a people search.")
+    parser.add_argument("--config", help="settings file to use instead of setup.ini")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("interactive", help="answer prompts for a single campaign (the default)")
+    run = commands.add_parser("run", help="run the campaigns in a job file, one after another in a single browser session")
+    run.add_argument("job_file", help="INI file with one section per job")
+    report = commands.add_parser("report", help="summarize throughput, stage timings and outcomes across recorded runs")
+    report.add_argument("--directory", help="where the run records are (default: [Runs] directory, runs)")
+    report.add_argument("--last", type=int, help="only the most recent N runs")
+    report.add_argument("--since-days", type=float, help="only runs started in the last N days")
+    report.add_argument("--json", dest="json_path", help="also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    init(autoreset=True)
+    load_config(args.config)
+    if args.command == "run":
+        return run_jobs(args.job_file)
+    if args.command == "report":
+        return show_report(args.directory, args.last, args.since_days, args.json_path)
+    run_interactive()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())